@@ -2,10 +2,16 @@
 
 import asyncio
 import os
-import re
-import time
+import random
+import sys
+from functools import lru_cache
 
-import requests
+if sys.version_info >= (3, 11):
+	import tomllib
+else:  # Declared as a dependency for interpreters without tomllib
+	import tomli as tomllib
+
+import httpx
 import typer
 from prefect import serve
 from prefect.client.orchestration import get_client
@@ -18,7 +24,7 @@ from rich.console import Console
 from tidal.flows.pipeline import pipeline
 from tidal.flows.transcode import transcode
 from tidal.utilities.types import Environment
-from tidal.utilities.vars import GlobalQueues, TaskQueues
+from tidal.utilities.vars import GlobalQueueConfig, GlobalQueues, TaskQueueConfig, TaskQueues
 
 console = Console()
 app = typer.Typer(no_args_is_help=True)
@@ -27,63 +33,80 @@ EnvironmentFlag = typer.Option(help="The deployment environment")
 
 PREFECT_APP_VARIABLE_KEY = "app_tidal"
 
+HEALTH_CHECK_TIMEOUT_SECONDS = 2.0
 
-def get_application_version() -> str:
-	with open("pyproject.toml") as f:
-		content = f.read()
+# API URLs already confirmed healthy in this process; `all` checks once per command
+_healthy_api_urls: set[str] = set()
 
-	match = re.search(r'\[project\].*?version\s*=\s*"([^"]+)"', content, re.DOTALL)
-	if match:
-		return match.group(1)
-	raise ValueError("Could not find version in pyproject.toml")
+
+@lru_cache(maxsize=1)
+def get_application_version() -> str:
+	with open("pyproject.toml", "rb") as f:
+		pyproject = tomllib.load(f)
+
+	try:
+		return pyproject["project"]["version"]
+	except KeyError:
+		raise ValueError("Could not find version in pyproject.toml") from None
+
+
+async def _ensure_task_queue(client, queue: TaskQueueConfig) -> None:
+	print(f"[blue]Setting Prefect Concurrency Limit for {queue}[/blue]")
+	try:
+		await client.create_concurrency_limit(tag=queue.name, concurrency_limit=queue.limit)
+		print(f"[green]Successfully set Prefect Concurrency Limit for {queue}![/green]")
+	except Exception as e:
+		print(f"[bold red]Failed to set concurrency limit for {queue}: {e}[/bold red]")
+
+
+async def _ensure_global_queue(client, queue: GlobalQueueConfig) -> None:
+	print(f"[blue]Setting Prefect Concurrency Limit for {queue.name}[/blue]")
+	try:
+		await client.read_global_concurrency_limit_by_name(name=queue.name)
+		await client.update_global_concurrency_limit(
+			name=queue.name,
+			concurrency_limit=GlobalConcurrencyLimitUpdate(
+				name=queue.name,
+				limit=queue.limit,
+				slot_decay_per_second=queue.slot_decay_per_second,
+			),
+		)
+
+		print(f"[green]Successfully set Prefect Concurrency Limit for {queue.name}![/green]")
+	except Exception:
+		print(f"[green]Queue did not exist, creating now... {queue.name}![/green]")
+		try:
+			await client.create_global_concurrency_limit(
+				concurrency_limit=GlobalConcurrencyLimitCreate(
+					limit=queue.limit, name=queue.name, slot_decay_per_second=queue.slot_decay_per_second
+				)
+			)
+		except Exception as e:
+			print(f"[bold red]Failed to create global concurrency limit for {queue.name}: {e}[/bold red]")
 
 
 @app.command()
 async def prefect_concurrency_limits():
 	print("[bold purple]Setting Prefect Concurrency Limits[/bold purple]")
 
-	if not prefect_server_check_configuration():
+	if not await prefect_server_check_configuration():
 		print("[bold red]Cannot proceed without Prefect server![/bold red]")
 		raise typer.Abort()
 
 	async with get_client() as client:
-		for queue in TaskQueues:
-			print(f"[blue]Setting Prefect Concurrency Limit for {queue}[/blue]")
-			try:
-				await client.create_concurrency_limit(tag=queue.name, concurrency_limit=queue.limit)
-				await client.read_concurrency_limit_by_tag(tag=queue.name)
-				print(f"[green]Successfully set Prefect Concurrency Limit for {queue}![/green]")
-			except Exception as e:
-				print(f"[bold red]Failed to set concurrency limit for {queue}: {e}[/bold red]")
-
-		for queue in GlobalQueues:
-			print(f"[blue]Setting Prefect Concurrency Limit for {queue.name}[/blue]")
-			try:
-				await client.read_global_concurrency_limit_by_name(name=queue.name)
-				await client.update_global_concurrency_limit(
-					name=queue.name,
-					concurrency_limit=GlobalConcurrencyLimitUpdate(
-						name=queue.name,
-						limit=queue.limit,
-						slot_decay_per_second=queue.slot_decay_per_second,
-					),
-				)
-
-				print(f"[green]Successfully set Prefect Concurrency Limit for {queue.name}![/green]")
-			except Exception:
-				print(f"[green]Queue did not exist, creating now... {queue.name}![/green]")
-				await client.create_global_concurrency_limit(
-					concurrency_limit=GlobalConcurrencyLimitCreate(
-						limit=queue.limit, name=queue.name, slot_decay_per_second=queue.slot_decay_per_second
-					)
-				)
+		# Each queue is independent, so overlap the API round trips
+		await asyncio.gather(
+			*[_ensure_task_queue(client, queue) for queue in TaskQueues],
+			*[_ensure_global_queue(client, queue) for queue in GlobalQueues],
+			return_exceptions=True,
+		)
 
 
 @app.command()
 def prefect_variables(environment: Environment = EnvironmentFlag) -> None:
 	print("[bold purple]Setting Prefect Variables[/bold purple]")
 
-	if not prefect_server_check_configuration():
+	if not asyncio.run(prefect_server_check_configuration()):
 		print("[bold red]Cannot proceed without Prefect server![/bold red]")
 		raise typer.Abort()
 
@@ -96,24 +119,31 @@ def prefect_variables(environment: Environment = EnvironmentFlag) -> None:
 	print("[bold green]Successfully set Prefect variables![/bold green]")
 
 
-def prefect_server_check_configuration(max_retries: int = 5, delay: int = 2) -> bool:
+async def prefect_server_check_configuration(max_retries: int = 8, base: float = 0.25, cap: float = 8.0) -> bool:
 	api_url = os.getenv("PREFECT_API_URL", "http://localhost:4200/api")
 	print(f"[bold blue]PREFECT_API_URL was sourced from env: {api_url}[/bold blue]")
 
 	if not api_url.endswith("/api"):
 		raise ValueError("Prefect API URL must end with '/api', I learned this the hard way...")
 
-	for _ in range(max_retries):
-		try:
-			response = requests.get(f"{api_url.rstrip('/api')}/api/health")
-			if response.status_code == 200:
-				return True
-			else:
-				print(f"[yellow]Prefect server not ready yet (status: {response.status_code}), retrying...[/yellow]")
-		except Exception as e:
-			print(f"[yellow]Prefect server connection error: {e}, retrying...[/yellow]")
+	if api_url in _healthy_api_urls:
+		return True
 
-		time.sleep(delay)
+	# One client for every attempt so retries reuse the pooled connection
+	async with httpx.AsyncClient(timeout=HEALTH_CHECK_TIMEOUT_SECONDS) as client:
+		for attempt in range(max_retries):
+			try:
+				response = await client.get(f"{api_url}/health")
+				if response.status_code == 200:
+					_healthy_api_urls.add(api_url)
+					return True
+				else:
+					print(f"[yellow]Prefect server not ready yet (status: {response.status_code}), retrying...[/yellow]")
+			except httpx.HTTPError as e:
+				print(f"[yellow]Prefect server connection error: {e}, retrying...[/yellow]")
+
+			# Capped exponential backoff with full jitter
+			await asyncio.sleep(random.uniform(0, min(cap, base * 2**attempt)))
 
 	print("[bold red]Failed to connect to Prefect server after multiple attempts[/bold red]")
 	return False
@@ -126,7 +156,7 @@ def prefect_flows(
 	app_version = get_application_version()
 	deployment_tags = [environment.value, app_version]
 
-	if not prefect_server_check_configuration():
+	if not asyncio.run(prefect_server_check_configuration()):
 		print("[bold red]Cannot proceed without Prefect server![/bold red]")
 		raise typer.Abort()
 
@@ -1,24 +1,84 @@
+import atexit
+import functools
 import json
 import os
 import shutil
 import subprocess
+import sys
 import tempfile
 from pathlib import Path
+from types import MappingProxyType
 from unittest.mock import MagicMock
 
 import pytest
 
+# Resolved once at import so fixtures and helpers don't re-walk $PATH
+_FFMPEG = shutil.which("ffmpeg")
+_FFPROBE = shutil.which("ffprobe")
+
+# RAM-backed scratch space for generated fixture media, when the platform has one
+_TMPFS = Path("/dev/shm") if Path("/dev/shm").is_dir() and os.access("/dev/shm", os.W_OK) else None
+
+
+def _shm_tmpdir(name: str) -> Path:
+	"""Create a scratch directory on tmpfs (or the system temp dir), removed at exit."""
+	root = _TMPFS or Path(tempfile.gettempdir())
+	directory = Path(tempfile.mkdtemp(prefix=f"tidal-tests-{os.getpid()}-{name}-", dir=root))
+	atexit.register(shutil.rmtree, directory, ignore_errors=True)
+	return directory
+
+
+@functools.lru_cache(maxsize=1)
+def _fast_h264_args() -> tuple[str, ...]:
+	"""Pick the quickest H.264 encoder args for generating tiny test clips.
+
+	Prefers VideoToolbox on macOS when this FFmpeg build has it, otherwise
+	libx264 ultrafast. Clips are sub-second, so a single thread avoids
+	paying frame-threading setup that would dominate the encode itself.
+	"""
+	if _FFMPEG and sys.platform == "darwin":
+		result = subprocess.run(
+			[_FFMPEG, "-hide_banner", "-encoders"],
+			capture_output=True,
+			text=True,
+			timeout=10,
+		)
+		if "h264_videotoolbox" in result.stdout:
+			return ("-c:v", "h264_videotoolbox", "-b:v", "500k", "-threads", "1")
+
+	return ("-c:v", "libx264", "-preset", "ultrafast", "-crf", "28", "-threads", "1")
+
+
+def pytest_collection_modifyitems(config, items):
+	"""Skip tests marked ``requires_ffmpeg``/``requires_ffprobe`` when the binary is missing."""
+	missing = {
+		"requires_ffmpeg": None if _FFMPEG else pytest.mark.skip(reason="FFmpeg not available"),
+		"requires_ffprobe": None if _FFPROBE else pytest.mark.skip(reason="ffprobe not available"),
+	}
+	for item in items:
+		for marker, skip in missing.items():
+			if skip is not None and item.get_closest_marker(marker):
+				item.add_marker(skip)
+
 
 @pytest.fixture(scope="session")
 def ffmpeg_available() -> bool:
 	"""Check if ffmpeg is available on the system."""
-	return shutil.which("ffmpeg") is not None
+	return _FFMPEG is not None
 
 
 @pytest.fixture(scope="session")
 def ffprobe_available() -> bool:
 	"""Check if ffprobe is available on the system."""
-	return shutil.which("ffprobe") is not None
+	return _FFPROBE is not None
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _isolated_cache_dir(tmp_path_factory):
+	"""Point tidal's on-disk caches at a per-session directory instead of ~/.cache."""
+	with pytest.MonkeyPatch.context() as mp:
+		mp.setenv("TIDAL_CACHE_DIR", str(tmp_path_factory.mktemp("tidal_cache")))
+		yield
 
 
 @pytest.fixture
@@ -28,22 +88,31 @@ def temp_dir(tmp_path):
 
 
 @pytest.fixture(scope="session")
-def sample_video(tmp_path_factory, ffmpeg_available) -> str:
-	"""Generate a short (2-second) test video with audio using FFmpeg's test sources.
+def _sample_media(ffmpeg_available) -> dict[str, str]:
+	"""Generate every session sample asset from a single multi-output FFmpeg run.
 
-	Returns the path to the generated video file. This fixture is session-scoped
-	to avoid regenerating the video for every test.
+	Produces a 2-second video with audio, the same video without audio, a
+	2-second audio-only file, and a 1-second video-only chunk. Outputs are
+	written to tmpfs where available since they only feed other FFmpeg
+	processes.
 	"""
 	if not ffmpeg_available:
 		pytest.skip("FFmpeg not available")
 
-	video_dir = tmp_path_factory.mktemp("sample_video")
-	video_path = str(video_dir / "test_video.mp4")
+	media_dir = _shm_tmpdir("sample_media")
+	paths = {
+		"video": str(media_dir / "test_video.mp4"),
+		"video_no_audio": str(media_dir / "test_video_no_audio.mp4"),
+		"audio": str(media_dir / "test_audio.m4a"),
+		"chunk": str(media_dir / "test_chunk.mkv"),
+	}
 
 	result = subprocess.run(
 		[
-			"ffmpeg",
+			_FFMPEG,
 			"-y",
+			"-loglevel",
+			"error",
 			"-f",
 			"lavfi",
 			"-i",
@@ -52,156 +121,175 @@ def sample_video(tmp_path_factory, ffmpeg_available) -> str:
 			"lavfi",
 			"-i",
 			"sine=frequency=440:duration=2",
-			"-c:v",
-			"libx264",
-			"-preset",
-			"ultrafast",
-			"-crf",
-			"28",
+			# Video with audio
+			"-map",
+			"0:v",
+			"-map",
+			"1:a",
+			*_fast_h264_args(),
+			"-pix_fmt",
+			"yuv420p",
+			"-c:a",
+			"aac",
+			"-b:a",
+			"64k",
+			paths["video"],
+			# Video without audio
+			"-map",
+			"0:v",
+			*_fast_h264_args(),
 			"-pix_fmt",
 			"yuv420p",
+			"-an",
+			paths["video_no_audio"],
+			# Audio only
+			"-map",
+			"1:a",
 			"-c:a",
 			"aac",
 			"-b:a",
 			"64k",
-			video_path,
+			paths["audio"],
+			# 1-second video-only chunk
+			"-map",
+			"0:v",
+			*_fast_h264_args(),
+			"-pix_fmt",
+			"yuv420p",
+			"-an",
+			"-t",
+			"1",
+			paths["chunk"],
 		],
-		capture_output=True,
-		text=True,
+		stdout=subprocess.DEVNULL,
+		stderr=subprocess.PIPE,
 		timeout=30,
 	)
 
 	if result.returncode != 0:
-		pytest.fail(f"Failed to generate sample video: {result.stderr}")
+		pytest.fail(f"Failed to generate sample media: {result.stderr.decode(errors='replace')}")
 
-	return video_path
+	return paths
 
 
 @pytest.fixture(scope="session")
-def sample_video_no_audio(tmp_path_factory, ffmpeg_available) -> str:
-	"""Generate a short test video without audio."""
-	if not ffmpeg_available:
-		pytest.skip("FFmpeg not available")
+def sample_video(_sample_media) -> str:
+	"""Path to a short (2-second) test video with audio."""
+	return _sample_media["video"]
 
-	video_dir = tmp_path_factory.mktemp("sample_video_no_audio")
-	video_path = str(video_dir / "test_video_no_audio.mp4")
 
-	result = subprocess.run(
-		[
-			"ffmpeg",
-			"-y",
-			"-f",
-			"lavfi",
-			"-i",
-			"testsrc2=size=320x240:rate=30:duration=2",
-			"-c:v",
-			"libx264",
-			"-preset",
-			"ultrafast",
-			"-crf",
-			"28",
-			"-pix_fmt",
-			"yuv420p",
-			"-an",
-			video_path,
-		],
-		capture_output=True,
-		text=True,
-		timeout=30,
-	)
+@pytest.fixture(scope="session")
+def sample_video_no_audio(_sample_media) -> str:
+	"""Path to a short test video without audio."""
+	return _sample_media["video_no_audio"]
 
-	if result.returncode != 0:
-		pytest.fail(f"Failed to generate sample video: {result.stderr}")
 
-	return video_path
+@pytest.fixture(scope="session")
+def sample_audio(_sample_media) -> str:
+	"""Path to a short (2-second) test audio file."""
+	return _sample_media["audio"]
 
 
 @pytest.fixture(scope="session")
-def sample_audio(tmp_path_factory, ffmpeg_available) -> str:
-	"""Generate a short (2-second) test audio file."""
-	if not ffmpeg_available:
-		pytest.skip("FFmpeg not available")
+def sample_chunk(_sample_media) -> str:
+	"""Path to a short video-only chunk (no audio) for encoding tests."""
+	return _sample_media["chunk"]
 
-	audio_dir = tmp_path_factory.mktemp("sample_audio")
-	audio_path = str(audio_dir / "test_audio.m4a")
 
-	result = subprocess.run(
-		[
-			"ffmpeg",
-			"-y",
-			"-f",
-			"lavfi",
-			"-i",
-			"sine=frequency=440:duration=2",
-			"-c:a",
-			"aac",
-			"-b:a",
-			"64k",
-			audio_path,
-		],
-		capture_output=True,
-		text=True,
-		timeout=30,
-	)
+class _ChunkPool:
+	"""A single canonical 0.5s video-only chunk, fanned out to tests via hardlinks.
 
-	if result.returncode != 0:
-		pytest.fail(f"Failed to generate sample audio: {result.stderr}")
+	Chunks generated with identical lavfi/encoder settings are byte-identical,
+	so one encode serves any chunk count.
+	"""
 
-	return audio_path
+	def __init__(self, root: Path):
+		self.root = root
+		self._chunk: str | None = None
+
+	@property
+	def chunk(self) -> str:
+		if self._chunk is None:
+			chunk_path = str(self.root / "chunk.mkv")
+
+			result = subprocess.run(
+				[
+					_FFMPEG,
+					"-y",
+					"-loglevel",
+					"error",
+					"-f",
+					"lavfi",
+					"-i",
+					"testsrc2=size=320x240:rate=30:duration=0.5",
+					*_fast_h264_args(),
+					"-pix_fmt",
+					"yuv420p",
+					"-an",
+					chunk_path,
+				],
+				stdout=subprocess.DEVNULL,
+				stderr=subprocess.PIPE,
+				timeout=30,
+			)
+
+			if result.returncode != 0:
+				pytest.fail(f"Failed to create chunk: {result.stderr.decode(errors='replace')}")
+
+			self._chunk = chunk_path
+		return self._chunk
+
+	def link(self, dest_dir: Path, count: int) -> list[str]:
+		"""Hardlink ``count`` copies of the chunk into ``dest_dir``, copying across devices."""
+		dest_dir.mkdir(parents=True, exist_ok=True)
+		chunks = []
+		for i in range(count):
+			dest = dest_dir / f"chunk_{i:04d}.mkv"
+			try:
+				os.link(self.chunk, dest)
+			except OSError:
+				shutil.copy(self.chunk, dest)
+			chunks.append(str(dest))
+		return chunks
 
 
 @pytest.fixture(scope="session")
-def sample_chunk(tmp_path_factory, ffmpeg_available) -> str:
-	"""Generate a short video-only chunk (no audio) for encoding tests."""
+def chunk_pool(tmp_path_factory, ffmpeg_available) -> _ChunkPool:
+	"""Session-wide source of 0.5s video-only chunks.
+
+	The chunk is encoded once; use ``chunk_pool.link()`` to place any number
+	of copies in a per-test directory.
+	"""
 	if not ffmpeg_available:
 		pytest.skip("FFmpeg not available")
 
-	chunk_dir = tmp_path_factory.mktemp("sample_chunk")
-	chunk_path = str(chunk_dir / "test_chunk.mkv")
+	return _ChunkPool(tmp_path_factory.mktemp("chunk_pool"))
 
-	result = subprocess.run(
-		[
-			"ffmpeg",
-			"-y",
-			"-f",
-			"lavfi",
-			"-i",
-			"testsrc2=size=320x240:rate=30:duration=1",
-			"-c:v",
-			"libx264",
-			"-preset",
-			"ultrafast",
-			"-crf",
-			"28",
-			"-pix_fmt",
-			"yuv420p",
-			"-an",
-			chunk_path,
-		],
-		capture_output=True,
-		text=True,
-		timeout=30,
-	)
-
-	if result.returncode != 0:
-		pytest.fail(f"Failed to generate sample chunk: {result.stderr}")
 
-	return chunk_path
+# Immutable so one shared result can't leak mutations between tests
+_MOCK_FFMPEG_OK = MappingProxyType(
+	{
+		"returncode": 0,
+		"stdout": "",
+		"stderr": "",
+		"command": ("ffmpeg", "-y"),
+	}
+)
 
 
 @pytest.fixture
 def mock_ffmpeg_processor(mocker):
 	"""Mock the FFmpegProcessor for unit tests that don't need real FFmpeg."""
+	from tidal.utilities.ffmpeg import get_processor
+
+	# get_processor() caches instances, so drop any real one built before the patch
+	get_processor.cache_clear()
 	mock_processor_class = mocker.patch("tidal.utilities.ffmpeg.FFmpegProcessor")
 	mock_instance = MagicMock()
 	mock_processor_class.return_value = mock_instance
-	mock_instance.execute_sync.return_value = {
-		"returncode": 0,
-		"stdout": "",
-		"stderr": "",
-		"command": ["ffmpeg", "-y"],
-	}
-	return mock_instance
+	mock_instance.execute_sync.return_value = _MOCK_FFMPEG_OK
+	yield mock_instance
+	get_processor.cache_clear()
 
 
 @pytest.fixture
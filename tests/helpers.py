@@ -0,0 +1,6 @@
+import os
+
+
+def assert_nonempty(path: str) -> None:
+	"""Assert that ``path`` exists and has content, with a single stat call."""
+	assert os.stat(path).st_size > 0
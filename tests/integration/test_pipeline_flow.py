@@ -1,5 +1,6 @@
+from dataclasses import dataclass
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 import pytest
 
@@ -7,33 +8,56 @@ from tidal.flows.pipeline import pipeline
 from tidal.models.transcode import CodecConfig, TranscodeJobInput, VideoResolution
 
 
+@dataclass(frozen=True)
+class _VMAFStub:
+	"""Stand-in for VMAFResult returned by the mocked calculate_vmaf_batch task."""
+
+	score: float
+	min_score: float
+	max_score: float
+	harmonic_mean: float
+	quality_rating: str
+
+
+_VMAF_EXCELLENT = _VMAFStub(score=95.0, min_score=90.0, max_score=99.0, harmonic_mean=94.5, quality_rating="Excellent")
+
+
 @pytest.mark.integration
 class TestPipelineFlow:
-	def test_pipeline_source_resolution(self, sample_video, temp_dir, ffmpeg_available):
-		"""Test full pipeline at source resolution.
-
-		VMAF is mocked since it requires libvmaf in the FFmpeg build.
+	@pytest.mark.requires_ffmpeg
+	@pytest.mark.parametrize(
+		("resolutions", "labels"),
+		[
+			(None, {"240p"}),  # Default ladder: the source resolution only
+			(
+				[
+					VideoResolution(width=320, height=240, label="240p"),  # Source resolution, no scaling
+					VideoResolution(width=160, height=120, label="120p"),
+				],
+				{"240p", "120p"},
+			),
+		],
+		ids=["default-resolution", "multiple-resolutions"],
+	)
+	def test_pipeline(self, sample_video, temp_dir, resolutions, labels):
+		"""Test the full pipeline at its default resolution and with a downscaled rendition.
+
+		Every rendition is produced by a single pipeline run so the
+		segmentation and audio work is shared. VMAF is mocked since it
+		requires libvmaf in the FFmpeg build.
 		"""
-		if not ffmpeg_available:
-			pytest.skip("FFmpeg not available")
-
 		output_dir = str(temp_dir / "output")
 
-		mock_vmaf_result = MagicMock()
-		mock_vmaf_result.score = 95.0
-		mock_vmaf_result.min_score = 90.0
-		mock_vmaf_result.max_score = 99.0
-		mock_vmaf_result.harmonic_mean = 94.5
-		mock_vmaf_result.quality_rating = "Excellent"
-
 		input_model = TranscodeJobInput(
 			source_path=sample_video,
 			output_dir=output_dir,
-			codec=CodecConfig(video_codec="libx264", preset="ultrafast", crf=28),
+			resolutions=resolutions,
+			codec=CodecConfig(video_codec="libx264", video_preset="ultrafast", crf=28),
 			segment_duration=1,
 		)
 
-		with patch("tidal.flows.pipeline.calculate_vmaf", return_value=mock_vmaf_result):
+		vmaf_results = {label: _VMAF_EXCELLENT for label in labels}
+		with patch("tidal.flows.pipeline.calculate_vmaf_batch", return_value=vmaf_results):
 			with patch("tidal.flows.pipeline.create_markdown_artifact"):
 				# Call the flow directly (not .fn()) so Prefect sets up the full context
 				result = pipeline(input=input_model)
@@ -41,35 +65,8 @@ class TestPipelineFlow:
 		assert "outputs" in result
 		assert "vmaf" in result
 		assert result["vmaf"]["score"] == 95.0
+		assert result["vmaf"]["renditions"] == {label: 95.0 for label in labels}
+		assert set(result["outputs"]) == labels
 
 		for label, path in result["outputs"].items():
 			assert Path(path).exists(), f"Output for {label} not found at {path}"
-
-	def test_pipeline_custom_resolution(self, sample_video, temp_dir, ffmpeg_available):
-		"""Test pipeline with a custom target resolution."""
-		if not ffmpeg_available:
-			pytest.skip("FFmpeg not available")
-
-		output_dir = str(temp_dir / "output")
-
-		mock_vmaf_result = MagicMock()
-		mock_vmaf_result.score = 88.0
-		mock_vmaf_result.min_score = 80.0
-		mock_vmaf_result.max_score = 95.0
-		mock_vmaf_result.harmonic_mean = 87.0
-		mock_vmaf_result.quality_rating = "Good"
-
-		input_model = TranscodeJobInput(
-			source_path=sample_video,
-			output_dir=output_dir,
-			resolutions=[VideoResolution(width=160, height=120, label="120p")],
-			codec=CodecConfig(video_codec="libx264", preset="ultrafast", crf=28),
-			segment_duration=1,
-		)
-
-		with patch("tidal.flows.pipeline.calculate_vmaf", return_value=mock_vmaf_result):
-			with patch("tidal.flows.pipeline.create_markdown_artifact"):
-				result = pipeline(input=input_model)
-
-		assert "120p" in result["outputs"]
-		assert Path(result["outputs"]["120p"]).exists()
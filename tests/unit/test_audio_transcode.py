@@ -2,37 +2,35 @@ from pathlib import Path
 
 import pytest
 
+from tests.helpers import assert_nonempty
 from tidal.models.transcode import CodecConfig
-from tidal.tasks.audio_transcode import transcode_audio, _codec_extension
+from tidal.tasks.audio_transcode import transcode_audio, _can_copy_audio, _codec_extension
+
+_transcode_audio = transcode_audio.fn
 
 
 class TestAudioTranscode:
-	def test_transcode_audio_aac(self, sample_audio, temp_dir, ffmpeg_available):
+	@pytest.mark.requires_ffmpeg
+	def test_transcode_audio_aac(self, sample_audio, temp_dir):
 		"""Test transcoding audio to AAC."""
-		if not ffmpeg_available:
-			pytest.skip("FFmpeg not available")
-
 		codec = CodecConfig(audio_codec="aac", audio_bitrate="128k")
 
-		result = transcode_audio.fn(
+		result = _transcode_audio(
 			audio_path=sample_audio,
 			output_dir=str(temp_dir),
 			codec=codec,
 		)
 
-		assert Path(result).exists()
-		assert Path(result).suffix == ".m4a"
-		assert Path(result).stat().st_size > 0
+		assert result.endswith(".m4a")
+		assert_nonempty(result)
 
-	def test_transcode_audio_creates_output_dir(self, sample_audio, temp_dir, ffmpeg_available):
+	@pytest.mark.requires_ffmpeg
+	def test_transcode_audio_creates_output_dir(self, sample_audio, temp_dir):
 		"""Test that audio transcode creates output directory."""
-		if not ffmpeg_available:
-			pytest.skip("FFmpeg not available")
-
 		codec = CodecConfig(audio_codec="aac", audio_bitrate="64k")
 		nested_dir = temp_dir / "nested" / "audio"
 
-		result = transcode_audio.fn(
+		result = _transcode_audio(
 			audio_path=sample_audio,
 			output_dir=str(nested_dir),
 			codec=codec,
@@ -40,14 +38,12 @@ class TestAudioTranscode:
 
 		assert Path(result).exists()
 
-	def test_transcode_audio_override_codec(self, sample_audio, temp_dir, ffmpeg_available):
+	@pytest.mark.requires_ffmpeg
+	def test_transcode_audio_override_codec(self, sample_audio, temp_dir):
 		"""Test overriding the codec via audio_codec parameter."""
-		if not ffmpeg_available:
-			pytest.skip("FFmpeg not available")
-
 		codec = CodecConfig(audio_codec="aac", audio_bitrate="64k")
 
-		result = transcode_audio.fn(
+		result = _transcode_audio(
 			audio_path=sample_audio,
 			output_dir=str(temp_dir),
 			codec=codec,
@@ -55,7 +51,22 @@ class TestAudioTranscode:
 		)
 
 		assert Path(result).exists()
-		assert Path(result).suffix == ".mp3"
+		assert result.endswith(".mp3")
+
+	@pytest.mark.requires_ffmpeg
+	def test_transcode_audio_passthrough(self, sample_audio, temp_dir):
+		"""Test that audio already in the target codec is copied into the target container."""
+		codec = CodecConfig(audio_codec="aac", audio_bitrate="64k")
+
+		result = _transcode_audio(
+			audio_path=sample_audio,
+			output_dir=str(temp_dir),
+			codec=codec,
+			source_codec="aac",
+		)
+
+		assert result.endswith(".m4a")
+		assert_nonempty(result)
 
 
 class TestCodecExtension:
@@ -81,3 +92,18 @@ class TestCodecExtension:
 
 	def test_unknown_codec_fallback(self):
 		assert _codec_extension("unknown_codec") == "mka"
+
+
+class TestCanCopyAudio:
+	def test_same_codec(self):
+		assert _can_copy_audio("aac", "aac") is True
+
+	def test_encoder_name_differs_from_codec(self):
+		assert _can_copy_audio("opus", "libopus") is True
+		assert _can_copy_audio("mp3", "libmp3lame") is True
+
+	def test_different_codec(self):
+		assert _can_copy_audio("ac3", "aac") is False
+
+	def test_unknown_source_codec(self):
+		assert _can_copy_audio(None, "aac") is False
@@ -1,20 +1,31 @@
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
+from tests.helpers import assert_nonempty
 from tidal.models.transcode import CodecConfig, VideoResolution
-from tidal.tasks.encode_chunk import encode_chunk
+from tidal.tasks.encode_chunk import (
+	_input_args,
+	_output_args,
+	_resolve_hw_accel,
+	encode_chunk,
+	encode_chunk_renditions,
+)
+from tidal.utilities.vars import ENCODER_THREADS_PER_PROCESS
+
+_encode_chunk = encode_chunk.fn
+_encode_chunk_renditions = encode_chunk_renditions.fn
 
 
 class TestEncodeChunk:
-	def test_encode_chunk_source_resolution(self, sample_chunk, temp_dir, ffmpeg_available):
+	@pytest.mark.requires_ffmpeg
+	def test_encode_chunk_source_resolution(self, sample_chunk, temp_dir):
 		"""Test encoding a chunk at source resolution."""
-		if not ffmpeg_available:
-			pytest.skip("FFmpeg not available")
-
-		codec = CodecConfig(video_codec="libx264", preset="ultrafast", crf=28)
+		codec = CodecConfig(video_codec="libx264", video_preset="ultrafast", crf=28)
 
-		result = encode_chunk.fn(
+		result = _encode_chunk(
 			chunk_path=sample_chunk,
 			output_dir=str(temp_dir),
 			codec=codec,
@@ -22,19 +33,16 @@ class TestEncodeChunk:
 			resolution_label="source",
 		)
 
-		assert Path(result).exists()
 		assert "encoded_source_0000" in result
-		assert Path(result).stat().st_size > 0
+		assert_nonempty(result)
 
-	def test_encode_chunk_with_scaling(self, sample_chunk, temp_dir, ffmpeg_available):
+	@pytest.mark.requires_ffmpeg
+	def test_encode_chunk_with_scaling(self, sample_chunk, temp_dir):
 		"""Test encoding a chunk with resolution scaling."""
-		if not ffmpeg_available:
-			pytest.skip("FFmpeg not available")
-
-		codec = CodecConfig(video_codec="libx264", preset="ultrafast", crf=28)
+		codec = CodecConfig(video_codec="libx264", video_preset="ultrafast", crf=28)
 		resolution = VideoResolution(width=160, height=120, label="120p")
 
-		result = encode_chunk.fn(
+		result = _encode_chunk(
 			chunk_path=sample_chunk,
 			output_dir=str(temp_dir),
 			codec=codec,
@@ -46,15 +54,13 @@ class TestEncodeChunk:
 		assert Path(result).exists()
 		assert "encoded_120p_0000" in result
 
-	def test_encode_chunk_creates_output_dir(self, sample_chunk, temp_dir, ffmpeg_available):
+	@pytest.mark.requires_ffmpeg
+	def test_encode_chunk_creates_output_dir(self, sample_chunk, temp_dir):
 		"""Test that encoding creates the output directory if it doesn't exist."""
-		if not ffmpeg_available:
-			pytest.skip("FFmpeg not available")
-
-		codec = CodecConfig(video_codec="libx264", preset="ultrafast", crf=28)
+		codec = CodecConfig(video_codec="libx264", video_preset="ultrafast", crf=28)
 		nested_dir = temp_dir / "nested" / "output"
 
-		result = encode_chunk.fn(
+		result = _encode_chunk(
 			chunk_path=sample_chunk,
 			output_dir=str(nested_dir),
 			codec=codec,
@@ -65,39 +71,216 @@ class TestEncodeChunk:
 		assert Path(result).exists()
 		assert "0005" in result
 
-	def test_encode_chunk_different_codecs(self, sample_chunk, temp_dir, ffmpeg_available):
+	@pytest.mark.requires_ffmpeg
+	def test_encode_chunk_different_codecs(self, sample_chunk, temp_dir):
 		"""Test encoding with different codec configurations."""
-		if not ffmpeg_available:
-			pytest.skip("FFmpeg not available")
-
 		configs = [
-			CodecConfig(video_codec="libx264", preset="ultrafast", crf=23),
-			CodecConfig(video_codec="libx264", preset="ultrafast", crf=35),
+			CodecConfig(video_codec="libx264", video_preset="ultrafast", crf=23),
+			CodecConfig(video_codec="libx264", video_preset="ultrafast", crf=35),
 		]
 
-		for i, codec in enumerate(configs):
-			result = encode_chunk.fn(
+		def encode(i: int, codec: CodecConfig) -> str:
+			return _encode_chunk(
 				chunk_path=sample_chunk,
 				output_dir=str(temp_dir / f"codec_{i}"),
 				codec=codec,
 				chunk_index=0,
 				resolution_label=f"test_{i}",
 			)
+
+		# Each encode is an independent FFmpeg process, so run them side by side
+		with ThreadPoolExecutor(max_workers=len(configs)) as executor:
+			results = list(executor.map(encode, range(len(configs)), configs))
+
+		for result in results:
 			assert Path(result).exists()
 
-	def test_encode_chunk_numbering(self, sample_chunk, temp_dir, ffmpeg_available):
+	@pytest.mark.requires_ffmpeg
+	def test_encode_chunk_numbering(self, sample_chunk, temp_dir):
 		"""Test that chunk numbering in output filename is correct."""
-		if not ffmpeg_available:
-			pytest.skip("FFmpeg not available")
+		codec = CodecConfig(video_codec="libx264", video_preset="ultrafast", crf=28)
 
-		codec = CodecConfig(video_codec="libx264", preset="ultrafast", crf=28)
+		indices = [0, 42, 999]
 
-		for idx in [0, 42, 999]:
-			result = encode_chunk.fn(
+		def encode(idx: int) -> str:
+			return _encode_chunk(
 				chunk_path=sample_chunk,
 				output_dir=str(temp_dir / f"chunk_{idx}"),
 				codec=codec,
 				chunk_index=idx,
 				resolution_label="source",
 			)
+
+		with ThreadPoolExecutor(max_workers=len(indices)) as executor:
+			results = list(executor.map(encode, indices))
+
+		for idx, result in zip(indices, results):
 			assert f"{idx:04d}" in Path(result).name
+
+
+class TestEncodeChunkRenditions:
+	@pytest.mark.requires_ffmpeg
+	def test_encode_multiple_renditions(self, sample_chunk, temp_dir):
+		"""Test that one call writes every rendition into its own directory."""
+		codec = CodecConfig(video_codec="libx264", video_preset="ultrafast", crf=28)
+
+		result = _encode_chunk_renditions(
+			chunk_path=sample_chunk,
+			output_dir=str(temp_dir),
+			codec=codec,
+			chunk_index=3,
+			renditions={
+				"240p": None,
+				"120p": VideoResolution(width=160, height=120, label="120p"),
+			},
+		)
+
+		assert set(result) == {"240p", "120p"}
+		for label, path in result.items():
+			assert Path(path).parent == temp_dir / f"encoded_{label}"
+			assert Path(path).name == f"encoded_{label}_0003.mkv"
+			assert_nonempty(path)
+
+	def test_encode_no_renditions_raises(self, temp_dir):
+		"""Test that an empty rendition set is rejected."""
+		with pytest.raises(ValueError, match="No renditions"):
+			_encode_chunk_renditions(
+				chunk_path="/nonexistent/chunk.mkv",
+				output_dir=str(temp_dir),
+				codec=CodecConfig(),
+				chunk_index=0,
+				renditions={},
+			)
+
+	def test_preset_ladder_reencodes_only_misses(self, tmp_path):
+		"""Test that only renditions below the VMAF target move on to the slower preset."""
+		chunk = tmp_path / "chunk.mkv"
+		chunk.write_bytes(b"chunk")
+		calls = []
+
+		def fake_execute(args, **kwargs):
+			presets = [args[i + 1] for i, arg in enumerate(args) if arg == "-preset"]
+			outputs = [arg for arg in args if arg.endswith(".mkv") and arg != str(chunk)]
+			calls.append((presets, outputs))
+			for output in outputs:
+				Path(output).write_bytes(b"encoded")
+
+		# The 720p rendition clears the target on the first preset, 360p never does
+		scores = {"encoded_720p": 97.0, "encoded_360p": 80.0}
+
+		async def fake_measure(pairs, **kwargs):
+			return [scores[Path(distorted_path).parent.name] for _, distorted_path in pairs]
+
+		with (
+			patch("tidal.tasks.encode_chunk.get_processor") as get_processor,
+			patch("tidal.tasks.encode_chunk.measure_vmaf_many", side_effect=fake_measure) as measure,
+		):
+			get_processor.return_value.execute_sync.side_effect = fake_execute
+			result = _encode_chunk_renditions(
+				chunk_path=str(chunk),
+				output_dir=str(tmp_path),
+				codec=CodecConfig(),
+				chunk_index=0,
+				renditions={"720p": None, "360p": VideoResolution(width=640, height=360, label="360p")},
+				target_vmaf=93.0,
+				preset_ladder=["veryfast", "medium", "slow"],
+			)
+
+		assert set(result) == {"720p", "360p"}
+		assert [presets for presets, _ in calls] == [["veryfast", "veryfast"], ["medium"], ["slow"]]
+		assert calls[1][1] == [result["360p"]]
+		assert measure.call_args.kwargs["threads"] == ENCODER_THREADS_PER_PROCESS
+		assert measure.call_args.kwargs["max_concurrent"] <= ENCODER_THREADS_PER_PROCESS
+
+	def test_renditions_share_thread_budget(self, tmp_path):
+		"""Test that outputs sharing one process split its encoder threads rather than each taking them all."""
+		chunk = tmp_path / "chunk.mkv"
+		chunk.write_bytes(b"chunk")
+
+		def fake_execute(args, **kwargs):
+			for arg in args:
+				if arg.endswith(".mkv") and arg != str(chunk):
+					Path(arg).write_bytes(b"encoded")
+
+		with patch("tidal.tasks.encode_chunk.get_processor") as get_processor:
+			get_processor.return_value.execute_sync.side_effect = fake_execute
+			_encode_chunk_renditions(
+				chunk_path=str(chunk),
+				output_dir=str(tmp_path),
+				codec=CodecConfig(),
+				chunk_index=0,
+				renditions={"720p": None, "360p": VideoResolution(width=640, height=360, label="360p")},
+			)
+
+		args = get_processor.return_value.execute_sync.call_args.kwargs["args"]
+		threads = [int(args[i + 1]) for i, arg in enumerate(args) if arg == "-threads"]
+		assert threads == [ENCODER_THREADS_PER_PROCESS // 2] * 2
+
+	def test_no_target_uses_codec_preset(self, tmp_path):
+		"""Test that without a VMAF target the ladder is ignored and nothing is scored."""
+		chunk = tmp_path / "chunk.mkv"
+		chunk.write_bytes(b"chunk")
+
+		def fake_execute(args, **kwargs):
+			Path(args[-1]).write_bytes(b"encoded")
+
+		with (
+			patch("tidal.tasks.encode_chunk.get_processor") as get_processor,
+			patch("tidal.tasks.encode_chunk.measure_vmaf_many") as measure_vmaf_many,
+		):
+			get_processor.return_value.execute_sync.side_effect = fake_execute
+			_encode_chunk_renditions(
+				chunk_path=str(chunk),
+				output_dir=str(tmp_path),
+				codec=CodecConfig(video_preset="fast"),
+				chunk_index=0,
+				renditions={"source": None},
+				preset_ladder=["veryfast", "slow"],
+			)
+
+		args = get_processor.return_value.execute_sync.call_args.kwargs["args"]
+		assert get_processor.return_value.execute_sync.call_count == 1
+		assert args[args.index("-preset") + 1] == "fast"
+		measure_vmaf_many.assert_not_called()
+
+
+class TestHardwareEncoderArgs:
+	def test_software_args_by_default(self):
+		codec = CodecConfig(crf=28)
+
+		args = _output_args(codec, None, "/out.mkv")
+
+		assert args[args.index("-c:v") + 1] == "libx264"
+		assert args[args.index("-crf") + 1] == "28"
+		assert args[args.index("-threads") + 1] == str(ENCODER_THREADS_PER_PROCESS)
+		assert _input_args(None) == []
+
+	def test_nvenc_args_stay_on_gpu(self):
+		codec = CodecConfig(crf=28, hw_accel="nvenc")
+		resolution = VideoResolution(width=160, height=120, label="120p")
+
+		args = _output_args(codec, resolution, "/out.mkv", "nvenc")
+
+		assert args[args.index("-c:v") + 1] == "h264_nvenc"
+		assert args[args.index("-cq") + 1] == "28"
+		assert args[args.index("-vf") + 1] == "scale_cuda=160:120"
+		assert _input_args("nvenc") == ["-hwaccel", "cuda", "-hwaccel_output_format", "cuda"]
+
+	def test_hevc_family_follows_codec(self):
+		codec = CodecConfig(video_codec="libx265", hw_accel="qsv")
+
+		args = _output_args(codec, None, "/out.mkv", "qsv")
+
+		assert args[args.index("-c:v") + 1] == "hevc_qsv"
+
+	def test_auto_falls_back_to_software_without_hw_family(self):
+		"""Test that auto never swaps a VP9/AV1 job onto an H.264 hardware encoder."""
+		with patch("tidal.tasks.encode_chunk._encoder_usable", return_value=True) as usable:
+			assert _resolve_hw_accel(CodecConfig(video_codec="libvpx-vp9", hw_accel="auto")) is None
+
+		usable.assert_not_called()
+
+	def test_explicit_accel_without_hw_family_rejected(self):
+		"""Test that asking for a hardware encoder the codec has none of fails instead of switching codec."""
+		with pytest.raises(ValueError, match="No nvenc encoder for libaom-av1"):
+			_resolve_hw_accel(CodecConfig(video_codec="libaom-av1", hw_accel="nvenc"))
@@ -0,0 +1,125 @@
+import asyncio
+from collections import OrderedDict
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import httpx
+import pytest
+from prefect.exceptions import ObjectNotFound
+
+from tidal.utilities.logging import _pending_updates, safe_create_progress, safe_update_progress
+
+
+class TestSafeCreateProgress:
+	def test_outside_run_skips_api(self):
+		"""Test that no artifact is created outside a flow or task run."""
+		with patch("tidal.utilities.logging.create_progress_artifact") as create:
+			assert safe_create_progress(0.0, "test") is None
+
+		create.assert_not_called()
+
+
+class TestSafeUpdateProgress:
+	def test_updates_throttled_until_complete(self):
+		"""Test that rapid updates collapse to one, while completion always goes through."""
+		artifact_id = uuid4()
+
+		with patch("tidal.utilities.logging.update_progress_artifact") as update:
+			for progress in (10.0, 20.0, 30.0, 100.0):
+				safe_update_progress(artifact_id, progress)
+
+		sent = [call.kwargs["progress"] for call in update.call_args_list]
+		assert sent == [10.0, 100.0]
+
+	def test_unchanged_progress_not_resent(self):
+		"""Test that a value that has not moved is dropped even once the interval has passed."""
+		artifact_id = uuid4()
+
+		with (
+			patch("tidal.utilities.logging.update_progress_artifact") as update,
+			patch("tidal.utilities.logging.time.monotonic", side_effect=[0.0, 5.0, 10.0]),
+		):
+			for progress in (40.0, 40.0, 41.0):
+				safe_update_progress(artifact_id, progress)
+
+		sent = [call.kwargs["progress"] for call in update.call_args_list]
+		assert sent == [40.0, 41.0]
+
+	def test_tracking_bounded(self):
+		"""Test that artifacts never completed (e.g. failed tasks) are evicted oldest first."""
+		artifact_ids = [uuid4() for _ in range(3)]
+
+		with (
+			patch("tidal.utilities.logging.update_progress_artifact"),
+			patch("tidal.utilities.logging._MAX_TRACKED_ARTIFACTS", 2),
+			patch("tidal.utilities.logging._last_progress_update", OrderedDict()) as tracked,
+		):
+			for artifact_id in artifact_ids:
+				safe_update_progress(artifact_id, 50.0)
+
+			assert list(tracked) == artifact_ids[1:]
+
+	def test_no_artifact_is_noop(self):
+		"""Test that updates without an artifact are ignored."""
+		with patch("tidal.utilities.logging.update_progress_artifact") as update:
+			safe_update_progress(None, 50.0)
+
+		update.assert_not_called()
+
+	def test_inside_event_loop_schedules_update(self):
+		"""Test that an intermediate update made on a running loop is awaited there instead of blocking it."""
+		artifact_id = uuid4()
+
+		async def report():
+			safe_update_progress(artifact_id, 50.0)
+			await asyncio.sleep(0)
+
+		with (
+			patch("tidal.utilities.logging.update_progress_artifact") as update,
+			patch("tidal.utilities.logging.aupdate_progress_artifact", new_callable=AsyncMock) as aupdate,
+		):
+			asyncio.run(report())
+
+		update.assert_not_called()
+		aupdate.assert_awaited_once_with(artifact_id=artifact_id, progress=50.0)
+		assert artifact_id not in _pending_updates
+
+	def test_completion_on_loop_sent_before_return(self):
+		"""Test that completion is sent synchronously and cancels updates still in flight, so none lands after it."""
+		artifact_id = uuid4()
+		finished = []
+
+		async def slow_update(**kwargs):
+			await asyncio.sleep(10)
+			finished.append(kwargs["progress"])
+
+		async def report():
+			safe_update_progress(artifact_id, 50.0)
+			await asyncio.sleep(0)  # Let the scheduled update start its round-trip
+			safe_update_progress(artifact_id, 100.0)
+			update.assert_called_once_with(artifact_id=artifact_id, progress=100.0, _sync=True)
+
+		with (
+			patch("tidal.utilities.logging.update_progress_artifact") as update,
+			patch("tidal.utilities.logging.aupdate_progress_artifact", side_effect=slow_update),
+		):
+			asyncio.run(report())
+
+		assert finished == []
+		assert artifact_id not in _pending_updates
+
+	def test_api_errors_swallowed_bugs_raised(self):
+		"""Test that transport failures are ignored while programming errors propagate."""
+		with patch("tidal.utilities.logging.update_progress_artifact", side_effect=httpx.ConnectError("down")):
+			safe_update_progress(uuid4(), 100.0)
+
+		with patch("tidal.utilities.logging.update_progress_artifact", side_effect=TypeError("bad call")):
+			with pytest.raises(TypeError):
+				safe_update_progress(uuid4(), 100.0)
+
+	def test_missing_artifact_ignored(self):
+		"""Test that a deleted artifact or finished run does not fail the task reporting to it."""
+		with patch("tidal.utilities.logging.update_progress_artifact", side_effect=ObjectNotFound(None)) as update:
+			safe_update_progress(uuid4(), 100.0)
+
+		update.assert_called_once()
@@ -39,6 +39,12 @@ class TestVideoResolution:
 		with pytest.raises(ValidationError, match="even"):
 			VideoResolution(width=1920, height=1081, label="bad")
 
+	def test_frozen_and_hashable(self):
+		res = VideoResolution(width=1280, height=720, label="720p")
+		with pytest.raises(ValidationError):
+			res.width = 640
+		assert hash(res) == hash(VideoResolution(width=1280, height=720, label="720p"))
+
 
 class TestCodecConfig:
 	def test_defaults(self):
@@ -72,6 +78,20 @@ class TestCodecConfig:
 		config = CodecConfig(crf=51)
 		assert config.crf == 51
 
+	def test_unknown_hw_accel_rejected(self):
+		with pytest.raises(ValidationError):
+			CodecConfig(hw_accel="cuda")
+
+	def test_unknown_field_rejected(self):
+		with pytest.raises(ValidationError, match="preset"):
+			CodecConfig(preset="ultrafast")
+
+	def test_frozen(self):
+		config = CodecConfig()
+		with pytest.raises(ValidationError, match="frozen"):
+			config.crf = 30
+		assert hash(config) == hash(CodecConfig())
+
 
 class TestTranscodeJobInput:
 	def test_valid_input(self, sample_video):
@@ -81,6 +101,7 @@ class TestTranscodeJobInput:
 		assert input_model.resolutions is None
 		assert input_model.segment_duration == 10
 		assert input_model.container == "mp4"
+		assert input_model.vmaf_subsample == 1
 
 	def test_nonexistent_source_rejected(self):
 		with pytest.raises(ValidationError, match="does not exist"):
@@ -112,6 +133,14 @@ class TestTranscodeJobInput:
 		with pytest.raises(ValidationError, match="positive"):
 			TranscodeJobInput(source_path=sample_video, segment_duration=-5)
 
+	def test_invalid_vmaf_subsample(self, sample_video):
+		with pytest.raises(ValidationError, match="positive"):
+			TranscodeJobInput(source_path=sample_video, vmaf_subsample=0)
+
+	def test_invalid_target_vmaf(self, sample_video):
+		with pytest.raises(ValidationError, match="between 0 and 100"):
+			TranscodeJobInput(source_path=sample_video, target_vmaf=120)
+
 	def test_unsupported_container(self, sample_video):
 		with pytest.raises(ValidationError, match="not supported"):
 			TranscodeJobInput(source_path=sample_video, container="avi")
@@ -2,16 +2,17 @@ from pathlib import Path
 
 import pytest
 
+from tests.helpers import assert_nonempty
 from tidal.tasks.mux import mux_audio_video
 
+_mux_audio_video = mux_audio_video.fn
+
 
 class TestMuxAudioVideo:
-	def test_mux_audio_video(self, sample_video_no_audio, sample_audio, temp_dir, ffmpeg_available):
+	@pytest.mark.requires_ffmpeg
+	def test_mux_audio_video(self, sample_video_no_audio, sample_audio, temp_dir):
 		"""Test muxing audio and video into a final output."""
-		if not ffmpeg_available:
-			pytest.skip("FFmpeg not available")
-
-		result = mux_audio_video.fn(
+		result = _mux_audio_video(
 			video_path=sample_video_no_audio,
 			audio_path=sample_audio,
 			output_dir=str(temp_dir),
@@ -19,16 +20,13 @@ class TestMuxAudioVideo:
 			container="mp4",
 		)
 
-		assert Path(result).exists()
 		assert "final_test.mp4" in result
-		assert Path(result).stat().st_size > 0
+		assert_nonempty(result)
 
-	def test_mux_mkv_container(self, sample_video_no_audio, sample_audio, temp_dir, ffmpeg_available):
+	@pytest.mark.requires_ffmpeg
+	def test_mux_mkv_container(self, sample_video_no_audio, sample_audio, temp_dir):
 		"""Test muxing into MKV container."""
-		if not ffmpeg_available:
-			pytest.skip("FFmpeg not available")
-
-		result = mux_audio_video.fn(
+		result = _mux_audio_video(
 			video_path=sample_video_no_audio,
 			audio_path=sample_audio,
 			output_dir=str(temp_dir),
@@ -39,14 +37,27 @@ class TestMuxAudioVideo:
 		assert Path(result).exists()
 		assert result.endswith(".mkv")
 
-	def test_mux_creates_output_dir(self, sample_video_no_audio, sample_audio, temp_dir, ffmpeg_available):
-		"""Test that mux creates the output directory if needed."""
-		if not ffmpeg_available:
-			pytest.skip("FFmpeg not available")
+	@pytest.mark.requires_ffmpeg
+	def test_mux_without_faststart(self, sample_video_no_audio, sample_audio, temp_dir):
+		"""Test muxing into MP4 in a single pass without relocating the moov atom."""
+		result = _mux_audio_video(
+			video_path=sample_video_no_audio,
+			audio_path=sample_audio,
+			output_dir=str(temp_dir),
+			label="test",
+			container="mp4",
+			faststart=False,
+		)
 
+		assert "final_test.mp4" in result
+		assert_nonempty(result)
+
+	@pytest.mark.requires_ffmpeg
+	def test_mux_creates_output_dir(self, sample_video_no_audio, sample_audio, temp_dir):
+		"""Test that mux creates the output directory if needed."""
 		nested_dir = temp_dir / "nested" / "final"
 
-		result = mux_audio_video.fn(
+		result = _mux_audio_video(
 			video_path=sample_video_no_audio,
 			audio_path=sample_audio,
 			output_dir=str(nested_dir),
@@ -6,14 +6,14 @@ import pytest
 
 from tidal.tasks.probe import probe_video
 
+_probe_video = probe_video.fn
+
 
 class TestProbeVideo:
-	def test_probe_real_video(self, sample_video, ffprobe_available):
+	@pytest.mark.requires_ffprobe
+	def test_probe_real_video(self, sample_video):
 		"""Test probing a real video file."""
-		if not ffprobe_available:
-			pytest.skip("ffprobe not available")
-
-		result = probe_video.fn(source_path=sample_video)
+		result = _probe_video(source_path=sample_video)
 
 		assert result.width == 320
 		assert result.height == 240
@@ -23,12 +23,10 @@ class TestProbeVideo:
 		assert result.duration > 0
 		assert result.frame_rate > 0
 
-	def test_probe_video_no_audio(self, sample_video_no_audio, ffprobe_available):
+	@pytest.mark.requires_ffprobe
+	def test_probe_video_no_audio(self, sample_video_no_audio):
 		"""Test probing a video file without audio."""
-		if not ffprobe_available:
-			pytest.skip("ffprobe not available")
-
-		result = probe_video.fn(source_path=sample_video_no_audio)
+		result = _probe_video(source_path=sample_video_no_audio)
 
 		assert result.width == 320
 		assert result.height == 240
@@ -38,7 +36,7 @@ class TestProbeVideo:
 	def test_probe_nonexistent_file(self):
 		"""Test that probing a nonexistent file raises FileNotFoundError."""
 		with pytest.raises(FileNotFoundError, match="does not exist"):
-			probe_video.fn(source_path="/nonexistent/video.mp4")
+			_probe_video(source_path="/nonexistent/video.mp4")
 
 	def test_probe_parses_ffprobe_json(self, tmp_path, sample_probe_json):
 		"""Test that probe correctly parses ffprobe JSON output."""
@@ -48,10 +46,10 @@ class TestProbeVideo:
 
 		mock_result = MagicMock()
 		mock_result.returncode = 0
-		mock_result.stdout = json.dumps(sample_probe_json)
+		mock_result.stdout = json.dumps(sample_probe_json).encode()
 
 		with patch("subprocess.run", return_value=mock_result):
-			result = probe_video.fn(source_path=str(dummy))
+			result = _probe_video(source_path=str(dummy))
 
 		assert result.width == 1920
 		assert result.height == 1080
@@ -62,6 +60,22 @@ class TestProbeVideo:
 		assert result.bitrate == 5500000
 		assert result.has_audio is True
 
+	def test_probe_reuses_cached_result(self, tmp_path, sample_probe_json):
+		"""Test that an unchanged file is only probed with ffprobe once."""
+		dummy = tmp_path / "video.mp4"
+		dummy.write_bytes(b"fake video data")
+
+		mock_result = MagicMock()
+		mock_result.returncode = 0
+		mock_result.stdout = json.dumps(sample_probe_json).encode()
+
+		with patch("subprocess.run", return_value=mock_result) as mock_run:
+			first = _probe_video(source_path=str(dummy))
+			second = _probe_video(source_path=str(dummy))
+
+		assert mock_run.call_count == 1
+		assert second == first
+
 	def test_probe_handles_fractional_fps(self, tmp_path):
 		"""Test parsing of fractional frame rates like 30000/1001."""
 		dummy = tmp_path / "video.mp4"
@@ -83,10 +97,10 @@ class TestProbeVideo:
 
 		mock_result = MagicMock()
 		mock_result.returncode = 0
-		mock_result.stdout = json.dumps(probe_json)
+		mock_result.stdout = json.dumps(probe_json).encode()
 
 		with patch("subprocess.run", return_value=mock_result):
-			result = probe_video.fn(source_path=str(dummy))
+			result = _probe_video(source_path=str(dummy))
 
 		assert abs(result.frame_rate - 29.97) < 0.01
 
@@ -108,11 +122,11 @@ class TestProbeVideo:
 
 		mock_result = MagicMock()
 		mock_result.returncode = 0
-		mock_result.stdout = json.dumps(probe_json)
+		mock_result.stdout = json.dumps(probe_json).encode()
 
 		with patch("subprocess.run", return_value=mock_result):
 			with pytest.raises(ValueError, match="No video stream"):
-				probe_video.fn(source_path=str(dummy))
+				_probe_video(source_path=str(dummy))
 
 	def test_probe_ffprobe_failure(self, tmp_path):
 		"""Test that probe raises RuntimeError on ffprobe failure."""
@@ -121,8 +135,8 @@ class TestProbeVideo:
 
 		mock_result = MagicMock()
 		mock_result.returncode = 1
-		mock_result.stderr = "ffprobe error"
+		mock_result.stderr = b"ffprobe error"
 
 		with patch("subprocess.run", return_value=mock_result):
 			with pytest.raises(RuntimeError, match="ffprobe failed"):
-				probe_video.fn(source_path=str(dummy))
+				_probe_video(source_path=str(dummy))
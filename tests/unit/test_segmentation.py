@@ -1,16 +1,16 @@
 import pytest
 
-from tidal.models.transcode import ProbeResult
+from tidal.models.transcode import CodecConfig, ProbeResult
 from tidal.tasks.segmentation import segment_video
 
+_segment_video = segment_video.fn
+
 
 class TestSegmentVideo:
-	def test_segment_real_video(self, sample_video, temp_dir, ffmpeg_available):
+	@pytest.mark.requires_ffmpeg
+	def test_segment_real_video(self, sample_video, temp_dir):
 		"""Test segmenting a real video produces chunks and extracts audio."""
-		if not ffmpeg_available:
-			pytest.skip("FFmpeg not available")
-
-		result = segment_video.fn(
+		result = _segment_video(
 			source_path=sample_video,
 			work_dir=str(temp_dir),
 			segment_duration=1,
@@ -30,11 +30,26 @@ class TestSegmentVideo:
 		# Verify audio file exists
 		assert Path(result.audio_path).exists()
 
-	def test_segment_video_no_audio(self, sample_video_no_audio, temp_dir, ffmpeg_available):
-		"""Test segmenting a video without audio."""
-		if not ffmpeg_available:
-			pytest.skip("FFmpeg not available")
+	@pytest.mark.requires_ffmpeg
+	def test_segment_transcodes_audio(self, sample_video, temp_dir):
+		"""Test that passing a codec encodes the audio in the segmentation pass."""
+		from pathlib import Path
+
+		result = _segment_video(
+			source_path=sample_video,
+			work_dir=str(temp_dir),
+			segment_duration=1,
+			codec=CodecConfig(audio_codec="aac", audio_bitrate="64k"),
+		)
 
+		assert result.segment_count > 0
+		assert result.audio_path is not None
+		assert result.audio_path.endswith(".m4a")
+		assert Path(result.audio_path).stat().st_size > 0
+
+	@pytest.mark.requires_ffmpeg
+	def test_segment_video_no_audio(self, sample_video_no_audio, temp_dir):
+		"""Test segmenting a video without audio."""
 		probe = ProbeResult(
 			duration=2.0,
 			width=320,
@@ -44,7 +59,7 @@ class TestSegmentVideo:
 			has_audio=False,
 		)
 
-		result = segment_video.fn(
+		result = _segment_video(
 			source_path=sample_video_no_audio,
 			work_dir=str(temp_dir),
 			segment_duration=1,
@@ -57,19 +72,26 @@ class TestSegmentVideo:
 	def test_segment_nonexistent_file(self, temp_dir):
 		"""Test that segmenting a nonexistent file raises FileNotFoundError."""
 		with pytest.raises(FileNotFoundError, match="does not exist"):
-			segment_video.fn(
+			_segment_video(
 				source_path="/nonexistent/video.mp4",
 				work_dir=str(temp_dir),
 			)
 
-	def test_segment_creates_work_dir(self, sample_video, temp_dir, ffmpeg_available):
-		"""Test that segmentation creates the work directory structure."""
-		if not ffmpeg_available:
-			pytest.skip("FFmpeg not available")
+	def test_segment_invalid_mode(self, temp_dir):
+		"""Test that an unknown segmentation mode is rejected before touching the source."""
+		with pytest.raises(ValueError, match="Unknown segmentation mode"):
+			_segment_video(
+				source_path="/nonexistent/video.mp4",
+				work_dir=str(temp_dir),
+				mode="transcode",
+			)
 
+	@pytest.mark.requires_ffmpeg
+	def test_segment_creates_work_dir(self, sample_video, temp_dir):
+		"""Test that segmentation creates the work directory structure."""
 		work_dir = temp_dir / "nested" / "work"
 
-		result = segment_video.fn(
+		result = _segment_video(
 			source_path=sample_video,
 			work_dir=str(work_dir),
 			segment_duration=1,
@@ -81,12 +103,10 @@ class TestSegmentVideo:
 		assert chunks_dir.exists()
 		assert result.segment_count > 0
 
-	def test_segment_short_duration(self, sample_video, temp_dir, ffmpeg_available):
+	@pytest.mark.requires_ffmpeg
+	def test_segment_short_duration(self, sample_video, temp_dir):
 		"""Test segmenting with a duration longer than the video produces one chunk."""
-		if not ffmpeg_available:
-			pytest.skip("FFmpeg not available")
-
-		result = segment_video.fn(
+		result = _segment_video(
 			source_path=sample_video,
 			work_dir=str(temp_dir),
 			segment_duration=30,  # Longer than our 2s test video
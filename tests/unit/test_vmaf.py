@@ -1,11 +1,16 @@
+import asyncio
 import json
+import re
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from tidal.models.transcode import VMAFResult
-from tidal.tasks.vmaf import calculate_vmaf, _build_vmaf_markdown
+from tidal.models.transcode import ProbeResult, VMAFResult
+from tidal.tasks.vmaf import calculate_vmaf, calculate_vmaf_batch, measure_vmaf_many, _build_vmaf_markdown, _parse_vmaf_log
+
+_calculate_vmaf = calculate_vmaf.fn
+_calculate_vmaf_batch = calculate_vmaf_batch.fn
 
 
 class TestCalculateVMAF:
@@ -24,24 +29,22 @@ class TestCalculateVMAF:
 
 		mock_result = MagicMock()
 		mock_result.returncode = 0
-		mock_result.stderr = ""
+		mock_result.stdout = json.dumps(vmaf_data).encode()
+		mock_result.stderr = b""
 
 		with (
 			patch("subprocess.run", return_value=mock_result),
-			patch("builtins.open", create=True) as mock_open,
-			patch("json.load", return_value=vmaf_data),
 			patch("tidal.tasks.vmaf.safe_create_progress", return_value=None),
 			patch("tidal.tasks.vmaf.safe_update_progress"),
 			patch("tidal.tasks.vmaf.create_markdown_artifact"),
 		):
 			# We need the file to exist for the check
 			with patch.object(Path, "exists", return_value=True):
-				with patch.object(Path, "unlink"):
-					result = calculate_vmaf.fn(
-						source_path=sample_video,
-						encoded_path=sample_video,
-						label="test",
-					)
+				result = _calculate_vmaf(
+					source_path=sample_video,
+					encoded_path=sample_video,
+					label="test",
+				)
 
 		assert result.score == 92.5
 		assert result.min_score == 85.0
@@ -49,13 +52,57 @@ class TestCalculateVMAF:
 		assert result.harmonic_mean == 91.8
 		assert result.quality_rating == "Good"
 
+	def test_vmaf_subsample_and_threads_in_filter(self, sample_video):
+		"""Test that subsampling and thread count are passed to libvmaf."""
+		mock_result = MagicMock()
+		mock_result.returncode = 0
+		mock_result.stdout = json.dumps({"pooled_metrics": {"vmaf": {"mean": 90.0}}}).encode()
+		mock_result.stderr = b""
+
+		with (
+			patch("subprocess.run", return_value=mock_result) as mock_run,
+			patch("tidal.tasks.vmaf.safe_create_progress", return_value=None),
+			patch("tidal.tasks.vmaf.safe_update_progress"),
+			patch("tidal.tasks.vmaf.create_markdown_artifact"),
+		):
+			_calculate_vmaf(
+				source_path=sample_video,
+				encoded_path=sample_video,
+				label="test",
+				subsample=5,
+				threads=3,
+			)
+
+		cmd = mock_run.call_args.args[0]
+		vmaf_filter = cmd[cmd.index("-lavfi") + 1]
+		assert "n_subsample=5" in vmaf_filter
+		assert "n_threads=3" in vmaf_filter
+
+	def test_vmaf_skips_audio(self, tmp_path):
+		"""Test that neither input's audio is decoded."""
+		source = tmp_path / "source.mp4"
+		source.write_bytes(b"fake")
+		mock_result = MagicMock(returncode=0, stdout=b'{"pooled_metrics": {"vmaf": {"mean": 90.0}}}', stderr=b"")
+
+		with (
+			patch("subprocess.run", return_value=mock_result) as mock_run,
+			patch("tidal.tasks.vmaf.safe_create_progress", return_value=None),
+			patch("tidal.tasks.vmaf.safe_update_progress"),
+			patch("tidal.tasks.vmaf.create_markdown_artifact"),
+		):
+			_calculate_vmaf(source_path=str(source), encoded_path=str(source), label="test")
+
+		cmd = mock_run.call_args.args[0]
+		assert all(cmd[i - 1] == "-an" for i, arg in enumerate(cmd) if arg == "-i")
+		assert cmd[cmd.index("-f") - 1] == "-an"
+
 	def test_vmaf_nonexistent_source(self, tmp_path):
 		"""Test that VMAF raises error for nonexistent source."""
 		encoded = tmp_path / "encoded.mp4"
 		encoded.write_bytes(b"fake")
 
 		with pytest.raises(FileNotFoundError, match="source"):
-			calculate_vmaf.fn(
+			_calculate_vmaf(
 				source_path="/nonexistent/source.mp4",
 				encoded_path=str(encoded),
 				label="test",
@@ -64,13 +111,149 @@ class TestCalculateVMAF:
 	def test_vmaf_nonexistent_encoded(self, sample_video):
 		"""Test that VMAF raises error for nonexistent encoded file."""
 		with pytest.raises(FileNotFoundError, match="encoded"):
-			calculate_vmaf.fn(
+			_calculate_vmaf(
 				source_path=sample_video,
 				encoded_path="/nonexistent/encoded.mp4",
 				label="test",
 			)
 
 
+class TestCalculateVMAFBatch:
+	def test_batch_scores_each_rendition(self, tmp_path):
+		"""Test that one FFmpeg run yields a result per rendition from its own log."""
+		video = tmp_path / "video.mp4"
+		video.write_bytes(b"fake")
+		scores = iter([91.0, 82.0])
+
+		def fake_run(cmd, **kwargs):
+			# Write each libvmaf log where the filter graph points it
+			graph = cmd[cmd.index("-filter_complex") + 1]
+			for log_path in re.findall(r"log_path=([^:]+)", graph):
+				mean = next(scores)
+				pooled = {"mean": mean, "min": mean - 5, "max": mean + 5, "harmonic_mean": mean - 1}
+				Path(log_path).write_text(json.dumps({"pooled_metrics": {"vmaf": pooled}}))
+			return MagicMock(returncode=0, stdout=b"", stderr=b"")
+
+		probe = ProbeResult(duration=2.0, width=320, height=240, video_codec="h264", frame_rate=30.0)
+
+		with (
+			patch("subprocess.run", side_effect=fake_run) as mock_run,
+			patch("tidal.tasks.vmaf.safe_create_progress", return_value=None),
+			patch("tidal.tasks.vmaf.safe_update_progress"),
+			patch("tidal.tasks.vmaf.create_markdown_artifact") as mock_artifact,
+		):
+			results = _calculate_vmaf_batch(
+				source_path=str(video),
+				encoded_paths={"240p": str(video), "120p": str(video)},
+				threads=4,
+				probe=probe,
+			)
+
+		assert mock_run.call_count == 1
+		assert results["240p"].score == 91.0
+		assert results["120p"].score == 82.0
+		assert mock_artifact.call_count == 2
+
+		cmd = mock_run.call_args.args[0]
+		graph = cmd[cmd.index("-filter_complex") + 1]
+		assert "split=2" in graph
+		assert "scale=320:240" in graph
+		assert graph.count("n_threads=2") == 2
+
+	def test_batch_requires_renditions(self, tmp_path):
+		"""Test that an empty rendition map is rejected."""
+		with pytest.raises(ValueError, match="No renditions"):
+			_calculate_vmaf_batch(source_path=str(tmp_path / "source.mp4"), encoded_paths={})
+
+	def test_batch_nonexistent_rendition(self, tmp_path):
+		"""Test that a missing rendition file is reported by label."""
+		source = tmp_path / "source.mp4"
+		source.write_bytes(b"fake")
+
+		with pytest.raises(FileNotFoundError, match="120p"):
+			_calculate_vmaf_batch(
+				source_path=str(source),
+				encoded_paths={"120p": "/nonexistent/encoded.mp4"},
+			)
+
+
+class TestMeasureVMAFMany:
+	def test_scores_pairs_concurrently_in_order(self):
+		"""Test that no more than max_concurrent runs overlap and scores keep the input order."""
+		running = 0
+		peak = 0
+		commands = []
+
+		async def fake_exec(*cmd, **kwargs):
+			commands.append(cmd)
+			score = float(cmd[cmd.index("-i") + 1].removesuffix(".mkv"))
+
+			async def communicate():
+				nonlocal running, peak
+				running += 1
+				peak = max(peak, running)
+				await asyncio.sleep(0.01)
+				running -= 1
+				return json.dumps({"pooled_metrics": {"vmaf": {"mean": score}}}).encode(), b""
+
+			return MagicMock(returncode=0, communicate=communicate)
+
+		pairs = [("chunk.mkv", f"{score}.mkv") for score in (91, 85, 97, 60)]
+		with (
+			patch("tidal.tasks.vmaf.asyncio.create_subprocess_exec", side_effect=fake_exec),
+			patch("tidal.tasks.vmaf.os.cpu_count", return_value=8),
+		):
+			scores = asyncio.run(measure_vmaf_many(pairs, max_concurrent=2, subsample=5))
+
+		assert scores == [91.0, 85.0, 97.0, 60.0]
+		assert peak == 2
+		vmaf_filter = commands[0][commands[0].index("-lavfi") + 1]
+		assert "n_threads=4" in vmaf_filter
+		assert "n_subsample=5" in vmaf_filter
+
+
+	def test_cancelled_run_kills_ffmpeg(self):
+		"""Test that cancelling the batch kills its libvmaf processes rather than orphaning them."""
+		process = MagicMock(returncode=None)
+
+		async def communicate():
+			await asyncio.sleep(60)
+
+		def kill():
+			process.returncode = -9
+
+		process.communicate = communicate
+		process.kill.side_effect = kill
+		process.wait = AsyncMock()
+
+		async def run():
+			task = asyncio.ensure_future(measure_vmaf_many([("chunk.mkv", "encoded.mkv")]))
+			await asyncio.sleep(0.01)
+			task.cancel()
+			with pytest.raises(asyncio.CancelledError):
+				await task
+
+		with patch("tidal.tasks.vmaf.asyncio.create_subprocess_exec", AsyncMock(return_value=process)):
+			asyncio.run(run())
+
+		process.kill.assert_called_once()
+		process.wait.assert_awaited_once()
+
+class TestParseVMAFLog:
+	def test_reads_pooled_metrics_after_frames(self):
+		"""Test that the pooled scores are found behind libvmaf's per-frame array."""
+		log = {
+			"version": "3.0.0",
+			"frames": [{"frameNum": i, "metrics": {"vmaf": 90.0}} for i in range(100)],
+			"pooled_metrics": {"vmaf": {"min": 88.0, "max": 96.0, "mean": 92.5, "harmonic_mean": 92.4}},
+			"aggregate_metrics": {},
+		}
+
+		result = _parse_vmaf_log(json.dumps(log, indent=4).encode())
+
+		assert result == VMAFResult(score=92.5, min_score=88.0, max_score=96.0, harmonic_mean=92.4)
+
+
 class TestBuildVMAFMarkdown:
 	def test_markdown_contains_score(self):
 		result = VMAFResult(score=92.5, min_score=85.0, max_score=99.0, harmonic_mean=91.8)
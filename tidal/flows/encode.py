@@ -1,13 +1,48 @@
+from typing import Optional
+
 from prefect import flow
 
 from tidal.utilities.logging import get_logger
-from prefect.futures import wait
+from prefect.futures import PrefectFuture, wait
 
 from tidal.models.transcode import CodecConfig, VideoResolution
 from tidal.tasks.concatenation import concatenate_chunks
 from tidal.tasks.encode_chunk import encode_chunk
 
 
+def submit_chunk_encodes(
+	chunk_paths: list[str],
+	resolution_label: str,
+	codec: CodecConfig,
+	output_dir: str,
+	resolution: Optional[VideoResolution] = None,
+	chunk_duration: Optional[float] = None,
+) -> list[PrefectFuture]:
+	"""Submit one encode_chunk task per chunk without waiting on them.
+
+	Must be called from inside a flow. Callers encoding several resolutions
+	can submit every batch up front and wait once, so workers never idle
+	at the tail of one resolution while the next is still unsubmitted.
+	``chunk_duration`` is forwarded so each encode can skip probing its
+	chunk for progress reporting.
+
+	Returns:
+		Futures for the encoded chunk paths, in chunk order
+	"""
+	return [
+		encode_chunk.submit(
+			chunk_path=chunk_path,
+			output_dir=output_dir,
+			codec=codec,
+			chunk_index=i,
+			resolution=resolution,
+			resolution_label=resolution_label,
+			chunk_duration=chunk_duration,
+		)
+		for i, chunk_path in enumerate(chunk_paths)
+	]
+
+
 @flow(
 	name="encode-resolution",
 	description="Encode all video chunks for a single resolution, then concatenate",
@@ -20,7 +55,8 @@ def encode_resolution(
 	codec: CodecConfig,
 	output_dir: str,
 	container: str = "mp4",
-	resolution: VideoResolution | None = None,
+	resolution: Optional[VideoResolution] = None,
+	chunk_duration: Optional[float] = None,
 ) -> str:
 	"""Sub-flow: encode all chunks for a single target resolution.
 
@@ -28,9 +64,11 @@ def encode_resolution(
 	execution, waits for all chunks to complete, then concatenates the
 	encoded chunks into a single video file.
 
-	This flow is designed to be called as a child flow from the main
-	pipeline, once per target resolution. In production with a Kubernetes
-	work pool, each chunk encoding task can run on a separate worker.
+	The main ``pipeline`` flow no longer calls this: it encodes every
+	resolution of a chunk in one process with ``encode_chunk_renditions``.
+	This flow stays public for encoding a single resolution on its own,
+	where each chunk's encode_chunk task can run on a separate worker
+	(e.g. in a Kubernetes work pool).
 
 	Args:
 		chunk_paths: List of source video chunk file paths
@@ -39,6 +77,8 @@ def encode_resolution(
 		output_dir: Directory to write encoded chunks and concatenated output
 		container: Output container format
 		resolution: Target resolution (None = encode at source resolution)
+		chunk_duration: Length of each chunk in seconds (e.g. the segment
+			duration), so encodes can skip probing their chunk for progress
 
 	Returns:
 		Path to the concatenated video file for this resolution
@@ -50,17 +90,14 @@ def encode_resolution(
 	)
 
 	# Submit all chunk encoding tasks in parallel
-	futures = []
-	for i, chunk_path in enumerate(chunk_paths):
-		future = encode_chunk.submit(
-			chunk_path=chunk_path,
-			output_dir=output_dir,
-			codec=codec,
-			chunk_index=i,
-			resolution=resolution,
-			resolution_label=resolution_label,
-		)
-		futures.append(future)
+	futures = submit_chunk_encodes(
+		chunk_paths=chunk_paths,
+		resolution_label=resolution_label,
+		codec=codec,
+		output_dir=output_dir,
+		resolution=resolution,
+		chunk_duration=chunk_duration,
+	)
 
 	# Wait for all encoding futures to complete
 	wait(futures)
@@ -1,18 +1,21 @@
-import uuid
+import os
+import time
 from pathlib import Path
 
 from prefect import flow
 from prefect.artifacts import create_markdown_artifact
+from prefect.futures import wait
+from prefect.task_runners import ThreadPoolTaskRunner
 
 from tidal.utilities.logging import get_logger
 
-from tidal.flows.encode import encode_resolution
 from tidal.models.transcode import CodecConfig, TranscodeJobInput, VideoResolution
-from tidal.tasks.audio_transcode import transcode_audio
-from tidal.tasks.mux import mux_audio_video
+from tidal.tasks.concatenation import concatenate_chunks
+from tidal.tasks.encode_chunk import encode_chunk_renditions
 from tidal.tasks.probe import probe_video
 from tidal.tasks.segmentation import segment_video
-from tidal.tasks.vmaf import calculate_vmaf
+from tidal.tasks.vmaf import calculate_vmaf_batch
+from tidal.utilities.vars import ENCODING_TASK_QUEUE
 
 
 @flow(
@@ -21,22 +24,28 @@ from tidal.tasks.vmaf import calculate_vmaf
 	log_prints=True,
 	flow_run_name="pipeline-{input.source_path}",
 	retries=0,
+	# Each chunk task runs a multi-threaded encode, so run only as many as the encoding queue admits;
+	# that queue's tag limit is only enforced when deploy.py has registered it with the server
+	task_runner=ThreadPoolTaskRunner(max_workers=ENCODING_TASK_QUEUE.limit),
 )
 def pipeline(input: TranscodeJobInput) -> dict:
 	"""Main orchestrator flow for the Tidal video processing pipeline.
 
 	This flow coordinates the full video processing pipeline:
 	1. Probe the source video for metadata
-	2. Segment the video into chunks (video-only) and extract audio
-	3. For each target resolution, run a sub-flow to encode chunks in parallel
-	4. Transcode audio independently
-	5. Mux audio into each encoded video
-	6. Calculate VMAF quality score on the primary output
+	2. Segment the video into chunks (video-only) and transcode the audio
+	   to the target codec in the same FFmpeg pass
+	3. Encode every chunk into every target resolution in parallel
+	4. Concatenate each resolution's chunks, muxing in the audio in the
+	   same pass
+	5. Calculate VMAF quality scores for every rendition in one pass
 
 	The pipeline is designed for parallelism:
-	- Chunk encoding within a resolution runs in parallel via task submission
-	- Multiple resolutions are processed sequentially (each is a sub-flow)
-	- Audio transcoding runs as a submitted task alongside video encoding
+	- Each chunk is encoded by one task that decodes it once and
+	  writes every target rendition; all chunk tasks are submitted as
+	  one batch and awaited once
+	- Audio is encoded while the source is demuxed for segmentation, so
+	  the source is read once and no separate audio process is spawned
 	- VMAF scoring happens after muxing
 
 	Args:
@@ -47,19 +56,24 @@ def pipeline(input: TranscodeJobInput) -> dict:
 	"""
 	logger = get_logger("pipeline")
 
+	started = time.monotonic()
 	source = Path(input.source_path)
-	logger.info(f"Starting Tidal pipeline for: {source.name}")
 
 	# Create unique working directory for this job
-	job_id = uuid.uuid4().hex[:8]
+	job_id = os.urandom(4).hex()
 	output_base = Path(input.output_dir) if input.output_dir else source.parent / "output"
 	work_dir = output_base / f"tidal_{source.stem}_{job_id}"
 	work_dir.mkdir(parents=True, exist_ok=True)
 
-	logger.info(f"Working directory: {work_dir}")
+	logger.info(
+		"Starting Tidal pipeline for %s in %s",
+		source.name,
+		work_dir,
+		extra={"event": "start", "src": input.source_path, "work_dir": str(work_dir)},
+	)
 
 	# ── Step 1: Probe source video ──────────────────────────────────────
-	logger.info("Step 1/6: Probing source video...")
+	logger.info("Step 1/5: Probing source video...")
 	probe = probe_video(source_path=input.source_path)
 
 	logger.info(f"Source: {probe.width}x{probe.height} {probe.video_codec} {probe.duration:.1f}s audio={probe.has_audio}")
@@ -79,86 +93,82 @@ def pipeline(input: TranscodeJobInput) -> dict:
 
 	logger.info(f"Target resolutions: {[r.label for r in target_resolutions]}")
 
-	# ── Step 3: Segment video and extract audio ─────────────────────────
-	logger.info("Step 2/6: Segmenting video...")
+	# ── Step 3: Segment video and transcode audio in one pass ───────────
+	logger.info("Step 2/5: Segmenting video and transcoding audio...")
 	segments = segment_video(
 		source_path=input.source_path,
 		work_dir=str(work_dir),
 		segment_duration=input.segment_duration,
 		probe=probe,
+		codec=input.codec,
 	)
 
-	logger.info(f"Segmentation complete: {segments.segment_count} chunks")
+	logger.info(f"Segmentation complete: {segments.segment_count} chunks audio={segments.audio_path is not None}")
+
+	# ── Step 4: Encode every rendition of each chunk from one decode ─────
+	logger.info("Step 3/5: Encoding video chunks...")
+
+	# Only scale renditions that differ from the source resolution
+	renditions: dict[str, VideoResolution | None] = {
+		resolution.label: (
+			None if (resolution.width, resolution.height) == (probe.width, probe.height) else resolution
+		)
+		for resolution in target_resolutions
+	}
 
-	# ── Step 4: Start audio transcoding (submitted for concurrent execution) ──
-	audio_future = None
-	if segments.audio_path and probe.has_audio:
-		logger.info("Step 3/6: Submitting audio transcode...")
-		audio_future = transcode_audio.submit(
-			audio_path=segments.audio_path,
+	futures = [
+		encode_chunk_renditions.submit(
+			chunk_path=chunk_path,
 			output_dir=str(work_dir),
 			codec=input.codec,
+			chunk_index=i,
+			renditions=renditions,
+			chunk_duration=float(input.segment_duration),
+			target_vmaf=input.target_vmaf,
+			preset_ladder=input.preset_ladder,
 		)
-	else:
-		logger.info("Step 3/6: No audio to transcode, skipping")
+		for i, chunk_path in enumerate(segments.chunk_paths)
+	]
 
-	# ── Step 5: Encode each resolution (sub-flows) ─────────────────────
-	logger.info("Step 4/6: Encoding video chunks...")
-	encoded_videos: dict[str, str] = {}
+	# Single barrier across every chunk
+	wait(futures)
 
-	for resolution in target_resolutions:
-		res_output_dir = str(work_dir / f"encoded_{resolution.label}")
+	# Collect results (will raise if any task failed)
+	encoded_chunks = [f.result() for f in futures]
 
-		# Determine whether we need to scale (only if different from source)
-		scale_resolution = None
-		if resolution.width != probe.width or resolution.height != probe.height:
-			scale_resolution = resolution
+	# ── Step 5: Concatenate chunks, muxing audio in the same pass ───────
+	logger.info("Step 4/5: Concatenating and muxing audio and video...")
+	transcoded_audio = segments.audio_path if probe.has_audio else None
+	final_outputs: dict[str, str] = {}
+	final_dir = str(work_dir / "final")
 
-		# Run encoding sub-flow (this handles parallel chunk encoding + concatenation)
-		video_path = encode_resolution(
-			chunk_paths=segments.chunk_paths,
-			resolution_label=resolution.label,
-			codec=input.codec,
-			output_dir=res_output_dir,
+	for label in renditions:
+		final_path = concatenate_chunks(
+			chunk_paths=[chunk[label] for chunk in encoded_chunks],
+			output_dir=final_dir if transcoded_audio else str(work_dir / f"encoded_{label}"),
+			label=label,
 			container=input.container,
-			resolution=scale_resolution,
+			audio_path=transcoded_audio,
 		)
 
-		encoded_videos[resolution.label] = video_path
-		logger.info(f"Resolution [{resolution.label}] encoding complete: {video_path}")
-
-	# ── Step 6: Wait for audio and mux ─────────────────────────────────
-	logger.info("Step 5/6: Muxing audio and video...")
-	final_outputs: dict[str, str] = {}
-
-	if audio_future:
-		transcoded_audio = audio_future.result()
+		final_outputs[label] = final_path
+		logger.info(f"Resolution [{label}] complete: {final_path}")
 
-		for label, video_path in encoded_videos.items():
-			final_path = mux_audio_video(
-				video_path=video_path,
-				audio_path=transcoded_audio,
-				output_dir=str(work_dir / "final"),
-				label=label,
-				container=input.container,
-			)
-			final_outputs[label] = final_path
-			logger.info(f"Muxed [{label}]: {final_path}")
-	else:
-		# No audio -- the encoded videos are already the final outputs
-		final_outputs = encoded_videos
-		logger.info("No audio to mux, encoded videos are final")
+	if not transcoded_audio:
+		logger.info("No audio to mux, concatenated videos are final")
 
-	# ── Step 7: Calculate VMAF on primary output ────────────────────────
-	logger.info("Step 6/6: Calculating VMAF quality score...")
+	# ── Step 6: Calculate VMAF on every output, decoding the source once ──
+	logger.info("Step 5/5: Calculating VMAF quality scores...")
 	primary_label = target_resolutions[0].label
-	primary_output = final_outputs[primary_label]
 
-	vmaf_result = calculate_vmaf(
+	vmaf_results = calculate_vmaf_batch(
 		source_path=input.source_path,
-		encoded_path=primary_output,
-		label=primary_label,
+		encoded_paths=final_outputs,
+		subsample=input.vmaf_subsample,
+		threads=input.vmaf_threads,
+		probe=probe,
 	)
+	vmaf_result = vmaf_results[primary_label]
 
 	# ── Create summary artifact ─────────────────────────────────────────
 	_create_pipeline_summary(
@@ -170,9 +180,19 @@ def pipeline(input: TranscodeJobInput) -> dict:
 		vmaf_rating=vmaf_result.quality_rating,
 	)
 
+	elapsed = time.monotonic() - started
 	logger.info(
-		f"Pipeline complete! VMAF={vmaf_result.score:.2f} ({vmaf_result.quality_rating}) "
-		f"Outputs: {list(final_outputs.keys())}"
+		"Pipeline complete in %.1fs: VMAF=%.2f (%s) outputs=%s",
+		elapsed,
+		vmaf_result.score,
+		vmaf_result.quality_rating,
+		list(final_outputs),
+		extra={
+			"event": "complete",
+			"src": input.source_path,
+			"duration_s": elapsed,
+			"outputs": list(final_outputs),
+		},
 	)
 
 	return {
@@ -182,6 +202,7 @@ def pipeline(input: TranscodeJobInput) -> dict:
 			"rating": vmaf_result.quality_rating,
 			"min": vmaf_result.min_score,
 			"max": vmaf_result.max_score,
+			"renditions": {label: result.score for label, result in vmaf_results.items()},
 		},
 		"work_dir": str(work_dir),
 	}
@@ -196,33 +217,38 @@ def _create_pipeline_summary(
 	vmaf_rating: str,
 ) -> None:
 	"""Create a summary markdown artifact for the pipeline run."""
-	outputs_table = "\n".join(f"| {label} | `{Path(path).name}` |" for label, path in final_outputs.items())
-
-	markdown = f"""# Tidal Pipeline Summary
-
-## Source
-- **File**: `{source_name}`
-- **Resolution**: {probe.width}x{probe.height}
-- **Duration**: {probe.duration:.1f}s
-- **Video Codec**: {probe.video_codec}
-- **Audio**: {"Yes (" + probe.audio_codec + ")" if probe.has_audio else "None"}
-
-## Encoding Configuration
-- **Video Codec**: {input.codec.video_codec}
-- **Preset**: {input.codec.video_preset}
-- **CRF**: {input.codec.crf}
-- **Audio Codec**: {input.codec.audio_codec} @ {input.codec.audio_bitrate}
-- **Container**: {input.container}
-
-## Outputs
-
-| Resolution | File |
-|------------|------|
-{outputs_table}
-
-## Quality
-- **VMAF Score**: **{vmaf_score:.2f}** ({vmaf_rating})
-"""
+	audio = f"Yes ({probe.audio_codec})" if probe.has_audio else "None"
+	output_rows = [f"| {label} | `{Path(path).name}` |" for label, path in final_outputs.items()]
+
+	# Collect every line and join once rather than nesting joins inside an f-string
+	lines = [
+		"# Tidal Pipeline Summary",
+		"",
+		"## Source",
+		f"- **File**: `{source_name}`",
+		f"- **Resolution**: {probe.width}x{probe.height}",
+		f"- **Duration**: {probe.duration:.1f}s",
+		f"- **Video Codec**: {probe.video_codec}",
+		f"- **Audio**: {audio}",
+		"",
+		"## Encoding Configuration",
+		f"- **Video Codec**: {input.codec.video_codec}",
+		f"- **Preset**: {input.codec.video_preset}",
+		f"- **CRF**: {input.codec.crf}",
+		f"- **Audio Codec**: {input.codec.audio_codec} @ {input.codec.audio_bitrate}",
+		f"- **Container**: {input.container}",
+		"",
+		"## Outputs",
+		"",
+		"| Resolution | File |",
+		"|------------|------|",
+		*output_rows,
+		"",
+		"## Quality",
+		f"- **VMAF Score**: **{vmaf_score:.2f}** ({vmaf_rating})",
+		"",
+	]
+	markdown = "\n".join(lines)
 
 	create_markdown_artifact(
 		key="pipeline-summary",
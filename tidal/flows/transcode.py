@@ -6,7 +6,7 @@ from prefect import flow
 from tidal.utilities.logging import get_logger, safe_create_progress, safe_update_progress
 from pydantic import BaseModel
 
-from tidal.utilities.ffmpeg import FFmpegProcessor, ProgressData
+from tidal.utilities.ffmpeg import ProgressData, get_processor
 
 
 class SimpleTranscodeInput(BaseModel):
@@ -49,7 +49,7 @@ def transcode(input: SimpleTranscodeInput) -> str:
 		f"Transcoding {source.name}",
 	)
 
-	processor = FFmpegProcessor()
+	processor = get_processor()
 
 	def on_progress(data: ProgressData) -> None:
 		if data.progress_percent is not None:
@@ -74,14 +74,16 @@ def transcode(input: SimpleTranscodeInput) -> str:
 		args=args,
 		input_file=input.source_path,
 		progress_callback=on_progress,
+		trusted=True,
 	)
 
-	if not output.exists():
-		raise RuntimeError(f"Transcoding failed: output not created at {output}")
+	try:
+		file_size_mb = output.stat().st_size / (1024 * 1024)
+	except FileNotFoundError:
+		raise RuntimeError(f"Transcoding failed: output not created at {output}") from None
 
 	safe_update_progress(progress_id, 100.0)
 
-	file_size_mb = output.stat().st_size / (1024 * 1024)
 	logger.info(f"Transcode complete: {output.name} ({file_size_mb:.1f} MB)")
 
 	return str(output)
@@ -1,82 +1,93 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Optional
+from typing import Literal, Optional
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, ConfigDict, model_validator
 
 
 class VideoResolution(BaseModel):
 	"""Represents a target video resolution."""
 
+	model_config = ConfigDict(frozen=True, extra="forbid")
+
 	width: int
 	height: int
 	label: str  # e.g. "1080p", "720p", "source"
 
-	@field_validator("width", "height")
-	@classmethod
-	def must_be_positive_even(cls, v: int) -> int:
-		if v <= 0:
-			raise ValueError("Resolution dimensions must be positive")
-		if v % 2 != 0:
-			raise ValueError("Resolution dimensions must be even for FFmpeg compatibility")
-		return v
+	@model_validator(mode="after")
+	def must_be_positive_even(self) -> VideoResolution:
+		# One check per model rather than one validator call per dimension
+		for v in (self.width, self.height):
+			if v <= 0:
+				raise ValueError("Resolution dimensions must be positive")
+			if v % 2 != 0:
+				raise ValueError("Resolution dimensions must be even for FFmpeg compatibility")
+		return self
 
 
 class CodecConfig(BaseModel):
 	"""Codec and encoding configuration."""
 
+	model_config = ConfigDict(frozen=True, extra="forbid")
+
 	video_codec: str = "libx264"
 	video_preset: str = "medium"
 	audio_codec: str = "aac"
 	audio_bitrate: str = "192k"
 	crf: int = 23
 	pixel_format: str = "yuv420p"
+	# Hardware video encoder: NVENC, Quick Sync, VideoToolbox, or the first usable one
+	hw_accel: Optional[Literal["nvenc", "qsv", "vt", "auto"]] = None
 
-	@field_validator("crf")
-	@classmethod
-	def crf_in_range(cls, v: int) -> int:
-		if not 0 <= v <= 51:
+	@model_validator(mode="after")
+	def crf_in_range(self) -> CodecConfig:
+		if not 0 <= self.crf <= 51:
 			raise ValueError("CRF must be between 0 and 51")
-		return v
+		return self
 
 
 class TranscodeJobInput(BaseModel):
 	"""Input parameters for the main pipeline flow."""
 
+	model_config = ConfigDict(frozen=True, extra="forbid")
+
 	source_path: str
 	output_dir: Optional[str] = None
 	resolutions: Optional[list[VideoResolution]] = None
 	codec: CodecConfig = CodecConfig()
 	segment_duration: int = 10
 	container: str = "mp4"
-
-	@field_validator("source_path")
-	@classmethod
-	def source_must_exist(cls, v: str) -> str:
-		if not Path(v).exists():
-			raise ValueError(f"Source file does not exist: {v}")
-		return v
-
-	@field_validator("segment_duration")
-	@classmethod
-	def segment_duration_positive(cls, v: int) -> int:
-		if v <= 0:
+	vmaf_subsample: int = 1  # Score every Nth frame; e.g. 5 trades some accuracy for a faster score
+	vmaf_threads: Optional[int] = None  # libvmaf worker threads, None for every core
+	# Per-chunk VMAF target; chunks that miss it are re-encoded with the next, slower preset
+	target_vmaf: Optional[float] = None
+	preset_ladder: list[str] = ["veryfast", "medium", "slow"]
+
+	@model_validator(mode="after")
+	def check_job(self) -> TranscodeJobInput:
+		if self.segment_duration <= 0:
 			raise ValueError("Segment duration must be positive")
-		return v
-
-	@field_validator("container")
-	@classmethod
-	def container_supported(cls, v: str) -> str:
+		if self.vmaf_subsample <= 0:
+			raise ValueError("VMAF subsample interval must be positive")
+		if self.target_vmaf is not None and not 0 <= self.target_vmaf <= 100:
+			raise ValueError("Target VMAF must be between 0 and 100")
+		if not self.preset_ladder:
+			raise ValueError("Preset ladder must name at least one preset")
 		supported = {"mp4", "mkv", "webm", "mov"}
-		if v not in supported:
-			raise ValueError(f"Container '{v}' not supported. Use one of: {supported}")
-		return v
+		if self.container not in supported:
+			raise ValueError(f"Container '{self.container}' not supported. Use one of: {supported}")
+		# Checked last so a bad job fails on its cheap fields without touching the filesystem
+		if not Path(self.source_path).exists():
+			raise ValueError(f"Source file does not exist: {self.source_path}")
+		return self
 
 
 class ProbeResult(BaseModel):
 	"""Result from probing a video file with ffprobe."""
 
+	model_config = ConfigDict(frozen=True, extra="forbid")
+
 	duration: float
 	width: int
 	height: int
@@ -94,6 +105,8 @@ class ProbeResult(BaseModel):
 class SegmentResult(BaseModel):
 	"""Result from segmenting a video file."""
 
+	model_config = ConfigDict(frozen=True, extra="forbid")
+
 	chunk_paths: list[str]
 	audio_path: Optional[str] = None
 	segment_count: int
@@ -103,6 +116,8 @@ class SegmentResult(BaseModel):
 class VMAFResult(BaseModel):
 	"""Result from VMAF quality calculation."""
 
+	model_config = ConfigDict(frozen=True, extra="forbid")
+
 	score: float
 	min_score: float
 	max_score: float
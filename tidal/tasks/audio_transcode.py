@@ -1,11 +1,12 @@
 from pathlib import Path
+from typing import Optional
 
 from prefect import task
 
 from tidal.utilities.logging import get_logger, safe_create_progress, safe_update_progress
 
-from tidal.models.transcode import CodecConfig
-from tidal.utilities.ffmpeg import FFmpegProcessor, ProgressData
+from tidal.models.transcode import CodecConfig, ProbeResult
+from tidal.utilities.ffmpeg import ProgressData, get_processor
 
 
 @task(
@@ -13,7 +14,7 @@ from tidal.utilities.ffmpeg import FFmpegProcessor, ProgressData
 	description="Transcode the audio stream to the target codec",
 	retries=2,
 	retry_delay_seconds=5,
-	tags=["encoding"],
+	tags=["audio"],
 	task_run_name="transcode-audio-{audio_codec}",
 )
 def transcode_audio(
@@ -21,12 +22,23 @@ def transcode_audio(
 	output_dir: str,
 	codec: CodecConfig,
 	audio_codec: str = "",
+	probe: Optional[ProbeResult] = None,
+	source_codec: Optional[str] = None,
 ) -> str:
 	"""Transcode audio to the target codec and bitrate.
 
 	Takes the extracted audio file and transcodes it to the configured
 	audio codec (default: AAC) and bitrate. Returns the path to the
-	transcoded audio file.
+	transcoded audio file. When the source probe is supplied, its
+	duration drives progress reporting instead of re-probing the audio.
+
+	If the audio is already in the target codec (``source_codec``, or the
+	probe's audio codec), it is stream-copied into the target container
+	instead of being decoded and re-encoded; the bitrate is left as is.
+
+	The ``pipeline`` flow encodes the audio during segmentation instead;
+	this task stays public for audio extracted on its own, and shares its
+	copy decision with segmentation through ``_can_copy_audio``.
 	"""
 	logger = get_logger("transcode-audio")
 	src = Path(audio_path)
@@ -36,28 +48,37 @@ def transcode_audio(
 	effective_codec = audio_codec or codec.audio_codec
 	output_file = out_dir / f"audio_transcoded.{_codec_extension(effective_codec)}"
 
-	logger.info(f"Transcoding audio: {effective_codec} @ {codec.audio_bitrate}")
+	if source_codec is None and probe:
+		source_codec = probe.audio_codec
+	passthrough = _can_copy_audio(source_codec, effective_codec)
+
+	if passthrough:
+		logger.info(f"Audio is already {source_codec}, copying without re-encoding")
+	else:
+		logger.info(f"Transcoding audio: {effective_codec} @ {codec.audio_bitrate}")
 
 	progress_id = safe_create_progress(
 		0.0,
 		f"Transcoding audio to {effective_codec}",
 	)
 
-	processor = FFmpegProcessor()
+	processor = get_processor()
 
 	def on_progress(data: ProgressData) -> None:
 		if data.progress_percent is not None:
 			safe_update_progress(progress_id, data.progress_percent)
 
+	if passthrough:
+		codec_args = ["-c:a", "copy"]
+	else:
+		codec_args = ["-c:a", effective_codec, "-b:a", codec.audio_bitrate]
+
 	args = [
 		"-y",
 		"-i",
 		audio_path,
 		"-vn",  # No video
-		"-c:a",
-		effective_codec,
-		"-b:a",
-		codec.audio_bitrate,
+		*codec_args,
 		str(output_file),
 	]
 
@@ -65,12 +86,14 @@ def transcode_audio(
 		args=args,
 		input_file=audio_path,
 		progress_callback=on_progress,
+		duration=probe.duration if probe else None,
+		trusted=True,
 	)
 
-	if not output_file.exists():
-		raise RuntimeError(f"Audio transcoding failed: output not created at {output_file}")
-
-	file_size_mb = output_file.stat().st_size / (1024 * 1024)
+	try:
+		file_size_mb = output_file.stat().st_size / (1024 * 1024)
+	except FileNotFoundError:
+		raise RuntimeError(f"Audio transcoding failed: output not created at {output_file}") from None
 	logger.info(f"Audio transcoded: {output_file.name} ({file_size_mb:.1f} MB)")
 
 	safe_update_progress(progress_id, 100.0)
@@ -78,16 +101,34 @@ def transcode_audio(
 	return str(output_file)
 
 
+_CODEC_EXTENSIONS: dict[str, str] = {
+	"aac": "m4a",
+	"libfdk_aac": "m4a",
+	"libopus": "opus",
+	"opus": "opus",
+	"libvorbis": "ogg",
+	"vorbis": "ogg",
+	"flac": "flac",
+	"libmp3lame": "mp3",
+	"mp3": "mp3",
+	"pcm_s16le": "wav",
+}
+
+
+# Encoders whose name differs from the codec name ffprobe reports for their output
+_ENCODER_CODECS: dict[str, str] = {
+	"libfdk_aac": "aac",
+	"libopus": "opus",
+	"libvorbis": "vorbis",
+	"libmp3lame": "mp3",
+}
+
+
 def _codec_extension(codec: str) -> str:
 	"""Map audio codec name to a suitable file extension."""
-	mapping = {
-		"aac": "m4a",
-		"libopus": "opus",
-		"opus": "opus",
-		"libvorbis": "ogg",
-		"flac": "flac",
-		"libmp3lame": "mp3",
-		"mp3": "mp3",
-		"pcm_s16le": "wav",
-	}
-	return mapping.get(codec, "mka")
+	return _CODEC_EXTENSIONS.get(codec, "mka")
+
+
+def _can_copy_audio(source_codec: Optional[str], encoder: str) -> bool:
+	"""Whether audio in ``source_codec`` already matches what ``encoder`` would produce."""
+	return source_codec is not None and source_codec == _ENCODER_CODECS.get(encoder, encoder)
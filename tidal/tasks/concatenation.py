@@ -1,11 +1,12 @@
-import tempfile
 from pathlib import Path
+from typing import Optional
 
 from prefect import task
 
 from tidal.utilities.logging import get_logger, safe_create_progress, safe_update_progress
 
-from tidal.utilities.ffmpeg import FFmpegProcessor, ProgressData
+from tidal.tasks.mux import FASTSTART_CONTAINERS
+from tidal.utilities.ffmpeg import ProgressData, get_processor
 
 
 @task(
@@ -21,19 +22,25 @@ def concatenate_chunks(
 	output_dir: str,
 	label: str = "output",
 	container: str = "mp4",
+	audio_path: Optional[str] = None,
 ) -> str:
 	"""Concatenate encoded video chunks back into a single video file.
 
 	Uses FFmpeg's concat demuxer to join encoded chunks in order.
-	This avoids re-encoding -- it simply joins the bitstreams. The
-	intermediate container is MKV for compatibility; final muxing
-	into the target container happens in the mux step.
+	This avoids re-encoding -- it simply joins the bitstreams. Without
+	``audio_path`` the result is an intermediate MKV for the mux step.
+	With it, the audio is muxed in during the same pass and the result
+	is the final ``final_{label}.{container}`` file, saving a full
+	read and rewrite of the concatenated video.
 	"""
 	logger = get_logger("concatenate-chunks")
 	out_dir = Path(output_dir)
 	out_dir.mkdir(parents=True, exist_ok=True)
 
-	output_file = out_dir / f"video_{label}.mkv"
+	if audio_path:
+		output_file = out_dir / f"final_{label}.{container}"
+	else:
+		output_file = out_dir / f"video_{label}.mkv"
 
 	if not chunk_paths:
 		raise ValueError("No chunks to concatenate")
@@ -45,57 +52,64 @@ def concatenate_chunks(
 		f"Concatenating {len(chunk_paths)} chunks [{label}]",
 	)
 
-	# Create concat list file
-	concat_list = tempfile.NamedTemporaryFile(
-		mode="w",
-		suffix=".txt",
-		dir=str(out_dir),
-		delete=False,
-		prefix="concat_",
-	)
+	# Build the concat list in memory and hand it to FFmpeg on stdin
+	# FFmpeg concat demuxer requires escaped single quotes in paths
+	concat_list = "".join(
+		"file '{}'\n".format(chunk_path.replace("'", "'\\''")) for chunk_path in chunk_paths
+	).encode()
+
+	processor = get_processor()
+
+	def on_progress(data: ProgressData) -> None:
+		if data.progress_percent is not None:
+			safe_update_progress(progress_id, data.progress_percent)
+
+	args = [
+		"-y",
+		"-protocol_whitelist",
+		"file,pipe",  # The list arrives over a pipe; the chunks it names are files
+		"-f",
+		"concat",
+		"-safe",
+		"0",
+		"-i",
+		"pipe:0",
+	]
+
+	if audio_path:
+		args.extend(
+			[
+				"-i",
+				audio_path,
+				"-map",
+				"0:v:0",
+				"-map",
+				"1:a:0",
+				"-shortest",  # Match duration to shortest stream
+			]
+		)
+		if container in FASTSTART_CONTAINERS:
+			args.extend(["-movflags", "+faststart"])
 
-	try:
-		for chunk_path in chunk_paths:
-			# FFmpeg concat demuxer requires escaped single quotes in paths
-			escaped_path = chunk_path.replace("'", "'\\''")
-			concat_list.write(f"file '{escaped_path}'\n")
-		concat_list.close()
-
-		processor = FFmpegProcessor()
-
-		def on_progress(data: ProgressData) -> None:
-			if data.progress_percent is not None:
-				safe_update_progress(progress_id, data.progress_percent)
-
-		args = [
-			"-y",
-			"-f",
-			"concat",
-			"-safe",
-			"0",
-			"-i",
-			concat_list.name,
+	args.extend(
+		[
 			"-c",
 			"copy",  # Stream copy (no re-encoding)
 			str(output_file),
 		]
+	)
 
-		processor.execute_sync(
-			args=args,
-			progress_callback=on_progress,
-		)
-
-	finally:
-		# Clean up concat list file
-		try:
-			Path(concat_list.name).unlink()
-		except OSError:
-			pass
-
-	if not output_file.exists():
-		raise RuntimeError(f"Concatenation failed: output not created at {output_file}")
+	processor.execute_sync(
+		args=args,
+		progress_callback=on_progress,
+		stdin_data=concat_list,
+		trusted=True,
+	)
 
-	file_size_mb = output_file.stat().st_size / (1024 * 1024)
+	try:
+		file_size_mb = output_file.stat().st_size / (1024 * 1024)
+	except FileNotFoundError:
+		raise RuntimeError(f"Concatenation failed: output not created at {output_file}") from None
 	logger.info(f"Concatenation complete: {output_file.name} ({file_size_mb:.1f} MB)")
 
 	safe_update_progress(progress_id, 100.0)
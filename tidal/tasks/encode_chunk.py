@@ -1,3 +1,6 @@
+import asyncio
+import subprocess
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -6,7 +9,15 @@ from prefect import task
 from tidal.utilities.logging import get_logger, safe_create_progress, safe_update_progress
 
 from tidal.models.transcode import CodecConfig, VideoResolution
-from tidal.utilities.ffmpeg import FFmpegProcessor, ProgressData
+from tidal.tasks.vmaf import measure_vmaf_many
+from tidal.utilities.ffmpeg import ProgressData, get_processor
+from tidal.utilities.vars import ENCODER_THREADS_PER_PROCESS
+
+# Encoder name suffix for each hardware accelerator, after the h264/hevc family
+_HW_ENCODER_SUFFIXES = {"nvenc": "nvenc", "qsv": "qsv", "vt": "videotoolbox"}
+
+# Per-chunk VMAF checks only need a rough score, so sample every 5th frame
+_LADDER_VMAF_SUBSAMPLE = 5
 
 
 @task(
@@ -24,12 +35,21 @@ def encode_chunk(
 	chunk_index: int,
 	resolution: Optional[VideoResolution] = None,
 	resolution_label: str = "source",
+	chunk_duration: Optional[float] = None,
+	target_vmaf: Optional[float] = None,
+	preset_ladder: Optional[list[str]] = None,
 ) -> str:
 	"""Encode a single video chunk.
 
 	Takes a video-only chunk and encodes it with the specified codec,
 	preset, CRF, and optionally scales to a target resolution. Returns
-	the path to the encoded chunk.
+	the path to the encoded chunk. Passing ``chunk_duration`` (e.g. the
+	segment length) lets progress reporting skip probing the chunk.
+
+	With ``target_vmaf`` and ``preset_ladder``, the chunk is first encoded
+	with the ladder's fastest preset and re-encoded with each slower one
+	only while its subsampled VMAF against the source chunk misses the
+	target, so easy chunks never pay for a slow preset.
 	"""
 	logger = get_logger("encode-chunk")
 	src = Path(chunk_path)
@@ -38,59 +58,309 @@ def encode_chunk(
 
 	label = resolution.label if resolution else resolution_label
 	output_file = out_dir / f"encoded_{label}_{chunk_index:04d}.mkv"
+	accel = _resolve_hw_accel(codec)
 
-	logger.info(f"Encoding chunk {chunk_index} -> {label} ({codec.video_codec} crf={codec.crf})")
+	logger.info(f"Encoding chunk {chunk_index} -> {label} ({codec.video_codec} crf={codec.crf} hw={accel})")
 
 	progress_id = safe_create_progress(
 		0.0,
 		f"Encoding chunk {chunk_index:04d} [{label}]",
 	)
 
-	processor = FFmpegProcessor()
+	processor = get_processor()
+
+	def on_progress(data: ProgressData) -> None:
+		if data.progress_percent is not None:
+			safe_update_progress(progress_id, data.progress_percent)
+
+	presets = _presets_to_try(codec, accel, target_vmaf, preset_ladder)
+	for step, preset in enumerate(presets):
+		step_codec = codec.model_copy(update={"video_preset": preset})
+
+		# Build FFmpeg arguments
+		args = ["-y", *_input_args(accel), "-i", chunk_path, *_output_args(step_codec, resolution, str(output_file), accel)]
+
+		processor.execute_sync(
+			args=args,
+			input_file=chunk_path,
+			progress_callback=on_progress,
+			duration=chunk_duration,
+			trusted=True,
+		)
+
+		if target_vmaf is None or step == len(presets) - 1:
+			break
+		if not _below_target(chunk_path, {label: str(output_file)}, target_vmaf):
+			break
+		logger.info(f"Chunk {chunk_index} [{label}] below VMAF {target_vmaf}, retrying with preset {presets[step + 1]}")
+
+	try:
+		file_size_mb = output_file.stat().st_size / (1024 * 1024)
+	except FileNotFoundError:
+		raise RuntimeError(f"Encoding failed: output file not created at {output_file}") from None
+	logger.info(f"Chunk {chunk_index} encoded: {output_file.name} ({file_size_mb:.1f} MB)")
+
+	safe_update_progress(progress_id, 100.0)
+
+	return str(output_file)
+
+
+@task(
+	name="encode-chunk-renditions",
+	description="Encode one video chunk into every target rendition from a single decode",
+	retries=2,
+	retry_delay_seconds=10,
+	tags=["encoding"],
+	task_run_name="encode-chunk-{chunk_index:04d}-renditions",
+)
+def encode_chunk_renditions(
+	chunk_path: str,
+	output_dir: str,
+	codec: CodecConfig,
+	chunk_index: int,
+	renditions: dict[str, Optional[VideoResolution]],
+	chunk_duration: Optional[float] = None,
+	target_vmaf: Optional[float] = None,
+	preset_ladder: Optional[list[str]] = None,
+) -> dict[str, str]:
+	"""Encode a single video chunk into several renditions at once.
+
+	Runs one FFmpeg process with an output per rendition, so the chunk is
+	demuxed and decoded once and the frames fan out to each output's
+	scaler and encoder. ``renditions`` maps each label to its target
+	resolution, or None to encode at the chunk's own resolution. Each
+	rendition is written to ``{output_dir}/encoded_{label}/``.
+
+	``target_vmaf`` and ``preset_ladder`` work as in ``encode_chunk``;
+	only the renditions that miss the target are re-encoded.
+
+	Returns:
+		Mapping of rendition label to encoded chunk path
+	"""
+	logger = get_logger("encode-chunk")
+
+	if not renditions:
+		raise ValueError("No renditions to encode")
+
+	accel = _resolve_hw_accel(codec)
+	output_files: dict[str, str] = {}
+	for label in renditions:
+		label_dir = Path(output_dir) / f"encoded_{label}"
+		label_dir.mkdir(parents=True, exist_ok=True)
+		output_files[label] = str(label_dir / f"encoded_{label}_{chunk_index:04d}.mkv")
+
+	logger.info(
+		f"Encoding chunk {chunk_index} -> {', '.join(renditions)} ({codec.video_codec} crf={codec.crf} hw={accel})"
+	)
+
+	progress_id = safe_create_progress(
+		0.0,
+		f"Encoding chunk {chunk_index:04d} [{', '.join(renditions)}]",
+	)
+
+	processor = get_processor()
 
 	def on_progress(data: ProgressData) -> None:
 		if data.progress_percent is not None:
 			safe_update_progress(progress_id, data.progress_percent)
 
-	# Build FFmpeg arguments
-	args = [
-		"-y",
-		"-i",
-		chunk_path,
-		"-c:v",
-		codec.video_codec,
-		"-preset",
-		codec.video_preset,
-		"-crf",
-		str(codec.crf),
-		"-pix_fmt",
-		codec.pixel_format,
-	]
+	# The queue limit budgets one encode's threads per task, so the outputs share them
+	threads_each = max(1, ENCODER_THREADS_PER_PROCESS // len(renditions))
+
+	pending = output_files
+	presets = _presets_to_try(codec, accel, target_vmaf, preset_ladder)
+	for step, preset in enumerate(presets):
+		step_codec = codec.model_copy(update={"video_preset": preset})
+
+		args = ["-y", *_input_args(accel), "-i", chunk_path]
+		for label, output_file in pending.items():
+			args.extend(["-map", "0:v:0", *_output_args(step_codec, renditions[label], output_file, accel, threads_each)])
+
+		processor.execute_sync(
+			args=args,
+			input_file=chunk_path,
+			progress_callback=on_progress,
+			duration=chunk_duration,
+			trusted=True,
+		)
+
+		if target_vmaf is None or step == len(presets) - 1:
+			break
+		pending = _below_target(chunk_path, pending, target_vmaf)
+		if not pending:
+			break
+		logger.info(
+			f"Chunk {chunk_index} [{', '.join(pending)}] below VMAF {target_vmaf}, "
+			f"retrying with preset {presets[step + 1]}"
+		)
+
+	for label, output_file in output_files.items():
+		try:
+			Path(output_file).stat()
+		except FileNotFoundError:
+			raise RuntimeError(f"Encoding failed: [{label}] output file not created at {output_file}") from None
+
+	logger.info(f"Chunk {chunk_index} encoded into {len(output_files)} renditions")
+
+	safe_update_progress(progress_id, 100.0)
+
+	return output_files
+
+
+def _output_args(
+	codec: CodecConfig,
+	resolution: Optional[VideoResolution],
+	output_file: str,
+	accel: Optional[str] = None,
+	threads: int = ENCODER_THREADS_PER_PROCESS,
+) -> list[str]:
+	"""Encoder options for one video-only output, scaling when a resolution is given.
+
+	``threads`` caps a software encoder's threads; outputs sharing one
+	process split ``ENCODER_THREADS_PER_PROCESS`` between them.
+	"""
+	family = _codec_family(codec.video_codec)
+	scale_filter = "scale"
+
+	if accel == "nvenc":
+		# Frames stay on the GPU from decode through scaling to encode
+		args = ["-c:v", f"{family}_nvenc", "-preset", "p4", "-tune", "hq", "-rc", "vbr", "-cq", str(codec.crf)]
+		scale_filter = "scale_cuda"
+	elif accel == "qsv":
+		args = ["-c:v", f"{family}_qsv", "-global_quality", str(codec.crf)]
+	elif accel == "vt":
+		# VideoToolbox has no CRF; map the 0-51 CRF scale linearly onto its 1-100 quality scale
+		args = ["-c:v", f"{family}_videotoolbox", "-q:v", str(round((51 - codec.crf) * 99 / 51) + 1)]
+	else:
+		args = [
+			"-threads",
+			str(threads),
+			"-c:v",
+			codec.video_codec,
+			"-preset",
+			codec.video_preset,
+			"-crf",
+			str(codec.crf),
+			"-pix_fmt",
+			codec.pixel_format,
+		]
 
 	# Add scaling filter if resolution is specified
 	if resolution:
 		args.extend(
 			[
 				"-vf",
-				f"scale={resolution.width}:{resolution.height}",
+				f"{scale_filter}={resolution.width}:{resolution.height}",
 			]
 		)
 
 	# No audio in chunks
-	args.extend(["-an", str(output_file)])
+	args.extend(["-an", output_file])
+	return args
 
-	processor.execute_sync(
-		args=args,
-		input_file=chunk_path,
-		progress_callback=on_progress,
+
+def _presets_to_try(
+	codec: CodecConfig,
+	accel: Optional[str],
+	target_vmaf: Optional[float],
+	preset_ladder: Optional[list[str]],
+) -> list[str]:
+	"""Presets to encode with in turn: the ladder when chasing a VMAF target, else just the codec's.
+
+	Hardware encoders do not take x264 presets, so they always make a single pass.
+	"""
+	if accel is None and target_vmaf is not None and preset_ladder:
+		return preset_ladder
+	return [codec.video_preset]
+
+
+def _below_target(chunk_path: str, output_files: dict[str, str], target_vmaf: float) -> dict[str, str]:
+	"""The outputs whose VMAF against the source chunk misses the target.
+
+	Other chunks keep encoding while this one is scored, so the check gets
+	the same ``ENCODER_THREADS_PER_PROCESS`` budget as one encode:
+	``measure_vmaf_many`` splits it across the concurrent libvmaf processes,
+	and no more run at once than there are threads to give them.
+	"""
+	scores = asyncio.run(
+		measure_vmaf_many(
+			[(chunk_path, output_file) for output_file in output_files.values()],
+			max_concurrent=min(len(output_files), ENCODER_THREADS_PER_PROCESS),
+			subsample=_LADDER_VMAF_SUBSAMPLE,
+			threads=ENCODER_THREADS_PER_PROCESS,
+		)
 	)
+	return {
+		label: output_file
+		for (label, output_file), score in zip(output_files.items(), scores)
+		if score < target_vmaf
+	}
 
-	if not output_file.exists():
-		raise RuntimeError(f"Encoding failed: output file not created at {output_file}")
 
-	file_size_mb = output_file.stat().st_size / (1024 * 1024)
-	logger.info(f"Chunk {chunk_index} encoded: {output_file.name} ({file_size_mb:.1f} MB)")
+def _input_args(accel: Optional[str]) -> list[str]:
+	"""Decoder options that go before ``-i``; NVENC decodes straight into GPU memory."""
+	if accel == "nvenc":
+		return ["-hwaccel", "cuda", "-hwaccel_output_format", "cuda"]
+	return []
 
-	safe_update_progress(progress_id, 100.0)
 
-	return str(output_file)
+def _codec_family(video_codec: str) -> Optional[str]:
+	"""The hardware encoder family matching a software codec name, or None if no hardware encoder covers it."""
+	if "265" in video_codec or "hevc" in video_codec:
+		return "hevc"
+	if "264" in video_codec:
+		return "h264"
+	return None
+
+
+def _resolve_hw_accel(codec: CodecConfig) -> Optional[str]:
+	"""The accelerator to encode with, resolving ``auto`` to the first one usable here.
+
+	``auto`` falls back to software for codecs without a hardware encoder
+	family; asking for a specific accelerator with one raises ValueError.
+	"""
+	family = _codec_family(codec.video_codec)
+	if codec.hw_accel != "auto":
+		if codec.hw_accel is not None and family is None:
+			raise ValueError(f"No {codec.hw_accel} encoder for {codec.video_codec}; use an H.264 or HEVC codec")
+		return codec.hw_accel
+	if family is None:
+		return None  # e.g. VP9 or AV1, which only have software encoders here
+	for accel, suffix in _HW_ENCODER_SUFFIXES.items():
+		if _encoder_usable(f"{family}_{suffix}"):
+			return accel
+	return None
+
+
+@lru_cache(maxsize=None)
+def _encoder_usable(encoder: str) -> bool:
+	"""Whether a test frame encodes with ``encoder``, i.e. it is built in and its device is present.
+
+	Listing ``-encoders`` is not enough: builds routinely ship NVENC and
+	Quick Sync without the hardware to run them. Cached per process.
+	"""
+	try:
+		result = subprocess.run(
+			[
+				get_processor().ffmpeg_path,
+				"-hide_banner",
+				"-v",
+				"error",
+				"-f",
+				"lavfi",
+				"-i",
+				"color=size=256x256:duration=0.1",
+				"-frames:v",
+				"1",
+				"-c:v",
+				encoder,
+				"-f",
+				"null",
+				"-",
+			],
+			capture_output=True,
+			timeout=30,
+		)
+	except (OSError, subprocess.TimeoutExpired):
+		return False
+	return result.returncode == 0
@@ -1,10 +1,35 @@
 from pathlib import Path
+from typing import Optional
 
 from prefect import task
 
 from tidal.utilities.logging import get_logger, safe_create_progress, safe_update_progress
 
-from tidal.utilities.ffmpeg import FFmpegProcessor, ProgressData
+from tidal.models.transcode import ProbeResult
+from tidal.utilities.ffmpeg import ProgressData, get_processor
+
+# ISO BMFF containers that support relocating the moov atom
+FASTSTART_CONTAINERS = frozenset({"mp4", "mov", "m4v"})
+
+# Fixed argv shape for the remux; only the {video}, {audio} and {out} slots vary per call
+_MUX_ARGS = (
+	"-y",
+	"-i",
+	"{video}",
+	"-i",
+	"{audio}",
+	"-map",
+	"0:v:0",  # Video only from the encoded video
+	"-map",
+	"1:a:0",  # Audio only from the transcoded audio
+	"-c",
+	"copy",  # Remux both streams without re-encoding
+	"-shortest",  # Match duration to shortest stream
+	"{out}",
+)
+
+# Same remux with the moov atom moved up front so playback can start before the download finishes
+_MUX_ARGS_FASTSTART = (*_MUX_ARGS[:-1], "-movflags", "+faststart", "{out}")
 
 
 @task(
@@ -20,12 +45,26 @@ def mux_audio_video(
 	output_dir: str,
 	label: str = "output",
 	container: str = "mp4",
+	probe: Optional[ProbeResult] = None,
+	faststart: bool = True,
 ) -> str:
 	"""Mux audio and video streams into a single output file.
 
 	Takes the concatenated video file and the transcoded audio file
 	and combines them into the final output container (default: mp4).
-	Uses stream copy to avoid re-encoding.
+	Uses stream copy to avoid re-encoding. When the source probe is
+	supplied, its duration drives progress reporting instead of
+	re-probing the video.
+
+	For MP4-family containers the moov atom is moved to the front by
+	default, which costs FFmpeg a second full read and write of the
+	output. Pass ``faststart=False`` when the file will not be streamed
+	progressively to write it in a single pass.
+
+	The ``pipeline`` flow muxes the audio in while concatenating chunks
+	instead; this task stays public for remuxing a video that is already
+	in one piece, and shares its faststart rule with that path through
+	``FASTSTART_CONTAINERS``.
 	"""
 	logger = get_logger("mux-audio-video")
 	out_dir = Path(output_dir)
@@ -40,36 +79,28 @@ def mux_audio_video(
 		f"Muxing audio into video [{label}]",
 	)
 
-	processor = FFmpegProcessor()
+	processor = get_processor()
 
 	def on_progress(data: ProgressData) -> None:
 		if data.progress_percent is not None:
 			safe_update_progress(progress_id, data.progress_percent)
 
-	args = [
-		"-y",
-		"-i",
-		video_path,
-		"-i",
-		audio_path,
-		"-c:v",
-		"copy",  # Copy video stream
-		"-c:a",
-		"copy",  # Copy audio stream (already transcoded)
-		"-shortest",  # Match duration to shortest stream
-		str(output_file),
-	]
+	template = _MUX_ARGS_FASTSTART if faststart and container in FASTSTART_CONTAINERS else _MUX_ARGS
+	slots = {"video": video_path, "audio": audio_path, "out": str(output_file)}
+	args = [part.format_map(slots) if "{" in part else part for part in template]
 
 	processor.execute_sync(
 		args=args,
 		input_file=video_path,
 		progress_callback=on_progress,
+		duration=probe.duration if probe else None,
+		trusted=True,
 	)
 
-	if not output_file.exists():
-		raise RuntimeError(f"Muxing failed: output not created at {output_file}")
-
-	file_size_mb = output_file.stat().st_size / (1024 * 1024)
+	try:
+		file_size_mb = output_file.stat().st_size / (1024 * 1024)
+	except FileNotFoundError:
+		raise RuntimeError(f"Muxing failed: output not created at {output_file}") from None
 	logger.info(f"Muxing complete: {output_file.name} ({file_size_mb:.1f} MB)")
 
 	safe_update_progress(progress_id, 100.0)
@@ -1,5 +1,8 @@
-import json
+import hashlib
+import os
 import subprocess
+import tempfile
+from functools import lru_cache
 from pathlib import Path
 
 from prefect import task
@@ -8,6 +11,17 @@ from tidal.utilities.logging import get_logger
 
 from tidal.models.transcode import ProbeResult
 
+try:
+	from orjson import loads as _json_loads
+except ImportError:  # orjson is an optional speedup; stdlib json parses the same output
+	from json import loads as _json_loads
+
+# Only the fields ProbeResult is built from, instead of every stream and format tag
+_PROBE_ENTRIES = (
+	"format=duration,bit_rate:"
+	"stream=codec_type,codec_name,width,height,r_frame_rate,bit_rate,duration"
+)
+
 
 @task(
 	name="probe-video",
@@ -26,8 +40,18 @@ def probe_video(source_path: str) -> ProbeResult:
 	logger = get_logger("probe-video")
 	path = Path(source_path)
 
-	if not path.exists():
-		raise FileNotFoundError(f"Source file does not exist: {source_path}")
+	try:
+		stat = path.stat()
+	except FileNotFoundError:
+		raise FileNotFoundError(f"Source file does not exist: {source_path}") from None
+
+	cache_file = _probe_cache_file(path, stat)
+	try:
+		cached = _read_cached_probe(cache_file)
+		logger.info(f"Probe cache hit: {source_path}")
+		return cached
+	except (OSError, ValueError):
+		pass
 
 	logger.info(f"Probing video file: {source_path}")
 
@@ -35,22 +59,22 @@ def probe_video(source_path: str) -> ProbeResult:
 		[
 			"ffprobe",
 			"-v",
-			"quiet",
+			"error",
 			"-print_format",
 			"json",
-			"-show_format",
-			"-show_streams",
+			"-show_entries",
+			_PROBE_ENTRIES,
 			source_path,
 		],
 		capture_output=True,
-		text=True,
 		timeout=30,
 	)
 
 	if result.returncode != 0:
-		raise RuntimeError(f"ffprobe failed: {result.stderr}")
+		raise RuntimeError(f"ffprobe failed: {result.stderr.decode(errors='replace').strip()}")
 
-	data = json.loads(result.stdout)
+	# ffprobe emits UTF-8 JSON; both parsers take the raw bytes without a decode step
+	data = _json_loads(result.stdout)
 
 	# Find video stream
 	video_stream = None
@@ -97,4 +121,46 @@ def probe_video(source_path: str) -> ProbeResult:
 		f"audio={probe_result.has_audio}"
 	)
 
+	_write_cached_probe(cache_file, probe_result)
+
 	return probe_result
+
+
+def _probe_cache_dir() -> Path:
+	"""Directory holding persisted probe results (override with TIDAL_CACHE_DIR)."""
+	cache_root = os.getenv("TIDAL_CACHE_DIR") or os.path.join(
+		os.getenv("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "tidal"
+	)
+	return Path(cache_root) / "ffprobe"
+
+
+def _probe_cache_file(path: Path, stat: os.stat_result) -> Path:
+	"""Cache location for a source file, keyed on its absolute path, size, and mtime.
+
+	Any change to the file's size or mtime produces a new key, so stale
+	entries are never read back and no explicit invalidation is needed.
+	"""
+	digest = hashlib.sha1(str(path.resolve()).encode()).hexdigest()
+	return _probe_cache_dir() / f"{digest}_{stat.st_size}_{stat.st_mtime_ns}.json"
+
+
+@lru_cache(maxsize=128)
+def _read_cached_probe(cache_file: Path) -> ProbeResult:
+	"""Load a persisted probe result; misses raise and are therefore not memoized."""
+	return ProbeResult.model_validate_json(cache_file.read_bytes())
+
+
+def _write_cached_probe(cache_file: Path, probe_result: ProbeResult) -> None:
+	"""Persist a probe result atomically. Failures only cost a future cache miss."""
+	try:
+		cache_file.parent.mkdir(parents=True, exist_ok=True)
+		fd, tmp_path = tempfile.mkstemp(dir=cache_file.parent, prefix=".probe_", suffix=".tmp")
+		try:
+			with os.fdopen(fd, "w") as f:
+				f.write(probe_result.model_dump_json())
+			os.replace(tmp_path, cache_file)
+		except OSError:
+			Path(tmp_path).unlink(missing_ok=True)
+			raise
+	except OSError as e:
+		get_logger("probe-video").warning(f"Could not write probe cache {cache_file}: {e}")
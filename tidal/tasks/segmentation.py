@@ -1,13 +1,17 @@
-import glob as glob_module
+import os
 import subprocess
 from pathlib import Path
+from typing import Optional
 
 from prefect import task
 
 from tidal.utilities.logging import get_logger, safe_create_progress, safe_update_progress
 
-from tidal.models.transcode import ProbeResult, SegmentResult
-from tidal.utilities.ffmpeg import FFmpegProcessor, ProgressData
+from tidal.models.transcode import CodecConfig, ProbeResult, SegmentResult
+from tidal.tasks.audio_transcode import _can_copy_audio, _codec_extension
+from tidal.utilities.ffmpeg import ProgressData, get_processor
+
+_SEGMENT_MODES = frozenset({"copy", "reencode"})
 
 
 @task(
@@ -22,18 +26,32 @@ def segment_video(
 	source_path: str,
 	work_dir: str,
 	segment_duration: int = 10,
-	probe: ProbeResult | None = None,
+	probe: Optional[ProbeResult] = None,
+	mode: str = "copy",
+	codec: Optional[CodecConfig] = None,
 ) -> SegmentResult:
 	"""Segment a video file into video-only chunks and extract audio.
 
-	Splits the source video into time-based segments using stream copy
-	(no re-encoding) for speed. Audio is extracted to a separate file
-	for independent processing.
+	In the default ``copy`` mode the source is split into time-based
+	segments using stream copy (no re-encoding), so cuts land on the
+	source's own keyframes. ``reencode`` mode re-encodes the video with a
+	fixed GOP of one segment (derived from the probed frame rate) for
+	sources whose keyframes are too sparse to split evenly. Audio is
+	extracted to a separate file in the same FFmpeg pass for independent
+	processing; if that fails, the video is segmented on its own.
+
+	When ``codec`` is given, the audio is encoded to its audio codec and
+	bitrate in that same pass instead of being stream-copied, so the
+	returned audio is final and needs no separate transcode. Audio the
+	probe reports as already being in that codec is copied as is.
 	"""
 	logger = get_logger("segment-video")
 	src = Path(source_path)
 	workdir = Path(work_dir)
 
+	if mode not in _SEGMENT_MODES:
+		raise ValueError(f"Unknown segmentation mode {mode!r}, expected one of {sorted(_SEGMENT_MODES)}")
+
 	if not src.exists():
 		raise FileNotFoundError(f"Source file does not exist: {source_path}")
 
@@ -49,23 +67,25 @@ def segment_video(
 		f"Segmenting video: {src.name}",
 	)
 
-	# Segment video (video only, no audio)
+	# Segment video and extract audio in one pass so the source is only demuxed once
 	segment_pattern = str(chunks_dir / f"{src.stem}_%04d.mkv")
+	audio_ext = _codec_extension(codec.audio_codec) if codec else "mkv"
+	audio_file = workdir / f"{src.stem}_audio.{audio_ext}"
+	has_audio = probe.has_audio if probe else True
 
-	processor = FFmpegProcessor()
+	processor = get_processor()
 
 	def on_progress(data: ProgressData) -> None:
 		if data.progress_percent is not None:
-			# Segmentation is roughly half the work (audio extraction is the other half)
-			safe_update_progress(progress_id, data.progress_percent * 0.7)
+			safe_update_progress(progress_id, data.progress_percent)
 
 	segment_args = [
 		"-y",
 		"-i",
 		source_path,
-		"-an",  # Strip audio
-		"-c:v",
-		"copy",  # Copy video codec (no re-encoding)
+		"-map",
+		"0:v:0",
+		*_video_codec_args(mode, segment_duration, probe),
 		"-f",
 		"segment",
 		"-segment_time",
@@ -74,46 +94,49 @@ def segment_video(
 		"1",
 		segment_pattern,
 	]
+	audio_args = [
+		"-map",
+		"0:a",
+		*_audio_codec_args(codec, probe),
+		str(audio_file),
+	]
 
-	processor.execute_sync(
-		args=segment_args,
-		input_file=source_path,
-		progress_callback=on_progress,
-	)
-
-	# Gather chunk paths (sorted)
-	chunk_paths = sorted(glob_module.glob(str(chunks_dir / f"{src.stem}_*.mkv")))
-
-	if not chunk_paths:
-		raise RuntimeError("Segmentation produced no chunks")
-
-	logger.info(f"Segmentation produced {len(chunk_paths)} chunks")
-
-	# Extract audio to a separate file (if source has audio)
 	audio_path = None
-	has_audio = probe.has_audio if probe else True
-
 	if has_audio:
-		audio_file = workdir / f"{src.stem}_audio.mkv"
 		logger.info(f"Extracting audio to {audio_file}")
-
 		try:
-			audio_args = [
-				"-y",
-				"-i",
-				source_path,
-				"-vn",  # Strip video
-				"-c:a",
-				"copy",  # Copy audio codec
-				str(audio_file),
-			]
-
-			processor.execute_sync(args=audio_args)
+			processor.execute_sync(
+				args=segment_args + audio_args,
+				input_file=source_path,
+				progress_callback=on_progress,
+				duration=probe.duration if probe else None,
+				trusted=True,
+			)
 			audio_path = str(audio_file)
 			logger.info("Audio extraction complete")
 		except Exception as e:
 			logger.warning(f"Audio extraction failed (source may have no audio): {e}")
-			audio_path = None
+
+	if audio_path is None:
+		processor.execute_sync(
+			args=segment_args,
+			input_file=source_path,
+			progress_callback=on_progress,
+			duration=probe.duration if probe else None,
+			trusted=True,
+		)
+
+	# Gather chunk paths in one directory pass; the zero-padded index makes the lexical sort numeric
+	prefix = f"{src.stem}_"
+	with os.scandir(chunks_dir) as entries:
+		chunk_paths = sorted(
+			entry.path for entry in entries if entry.name.startswith(prefix) and entry.name.endswith(".mkv")
+		)
+
+	if not chunk_paths:
+		raise RuntimeError("Segmentation produced no chunks")
+
+	logger.info(f"Segmentation produced {len(chunk_paths)} chunks")
 
 	safe_update_progress(progress_id, 100.0)
 
@@ -123,3 +146,23 @@ def segment_video(
 		segment_count=len(chunk_paths),
 		work_dir=work_dir,
 	)
+
+
+def _audio_codec_args(codec: Optional[CodecConfig], probe: Optional[ProbeResult]) -> list[str]:
+	"""Audio codec arguments for the audio output."""
+	if codec is None or _can_copy_audio(probe.audio_codec if probe else None, codec.audio_codec):
+		return ["-c:a", "copy"]  # Copy audio codec
+	return ["-c:a", codec.audio_codec, "-b:a", codec.audio_bitrate]
+
+
+def _video_codec_args(mode: str, segment_duration: int, probe: Optional[ProbeResult]) -> list[str]:
+	"""Video codec arguments for the segment output."""
+	if mode == "copy":
+		return ["-c:v", "copy"]  # Copy video codec (no re-encoding)
+
+	# Near-lossless intermediate with a keyframe at every segment boundary
+	args = ["-c:v", "libx264", "-preset", "veryfast", "-crf", "16", "-sc_threshold", "0"]
+	if probe and probe.frame_rate > 0:
+		gop = str(max(1, round(probe.frame_rate * segment_duration)))
+		args.extend(["-g", gop, "-keyint_min", gop])
+	return args
@@ -7,15 +7,16 @@ import time
 import logging
 import tempfile
 import shutil
-import signal
-from abc import ABC, abstractmethod
-from contextlib import contextmanager, asynccontextmanager
+import selectors
 from dataclasses import dataclass
-from enum import Enum
-from functools import wraps
-from pathlib import Path
-from typing import Dict, Any, List, Optional, Union, Callable, AsyncGenerator
-from concurrent.futures import ThreadPoolExecutor
+from enum import IntEnum
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+try:
+		import fcntl
+except ImportError:  # Not available on Windows
+		fcntl = None
 
 # Exception Hierarchy
 class FFmpegError(Exception):
@@ -51,12 +52,85 @@ class ProgressData:
 		status: str = "processing"
 
 # Event Types
-class EventType(Enum):
-		STARTED = "started"
-		PROGRESS = "progress"
-		COMPLETED = "completed"
-		ERROR = "error"
-		TERMINATED = "terminated"
+class EventType(IntEnum):
+		# Dense values so handlers can be stored in a list indexed by event type
+		STARTED = 0
+		PROGRESS = 1
+		COMPLETED = 2
+		ERROR = 3
+		TERMINATED = 4
+
+# Shell metacharacters rejected in arguments, matched in a single scan per argument
+_DANGEROUS_CHARS = re.compile(r'[;&|`$()<>]')
+
+# Setters for each -progress key we report; FFmpeg writes exactly one key=value per line
+_PROGRESS_HANDLERS: Dict[str, Callable[[ProgressData, str], None]] = {
+		'frame': lambda data, value: setattr(data, 'frame', int(value)),
+		'fps': lambda data, value: setattr(data, 'fps', float(value)),
+		# Despite the name, out_time_ms is in microseconds
+		'out_time_ms': lambda data, value: setattr(data, 'time_seconds', int(value) / 1_000_000),
+		# kbits/s to bits/s
+		'bitrate': lambda data, value: setattr(data, 'bitrate', int(float(value[:-len('kbits/s')]) * 1000)),
+		'speed': lambda data, value: setattr(data, 'speed', float(value[:-1])),
+		'total_size': lambda data, value: setattr(data, 'size', int(value)),
+		'progress': lambda data, value: setattr(data, 'status', value),
+}
+
+# Kernel buffer requested for FFmpeg's output pipes (Linux caps it at /proc/sys/fs/pipe-max-size)
+_PIPE_SIZE = 1 << 20
+
+def _grow_pipe(fd: int) -> None:
+		"""Enlarge a pipe's kernel buffer where supported, so each read drains more output"""
+		if fcntl is None or not hasattr(fcntl, 'F_SETPIPE_SZ'):
+				return
+		try:
+				fcntl.fcntl(fd, fcntl.F_SETPIPE_SZ, _PIPE_SIZE)
+		except OSError:
+				pass
+
+def _open_pidfd(pid: int) -> Optional[int]:
+		"""Open a pidfd for the process (Linux 5.3+), or None where unsupported"""
+		if not hasattr(os, 'pidfd_open'):
+				return None
+		try:
+				return os.pidfd_open(pid)
+		except OSError:
+				return None
+
+@lru_cache(maxsize=1)
+def _find_ffmpeg() -> str:
+		"""Locate the FFmpeg executable once per process"""
+		# Search in trusted paths
+		trusted_paths = ['/usr/bin/ffmpeg', '/usr/local/bin/ffmpeg', '/opt/homebrew/bin/ffmpeg']
+		for path in trusted_paths:
+				if os.path.isfile(path) and os.access(path, os.X_OK):
+						return path
+		
+		# Fallback to system PATH
+		ffmpeg_path = shutil.which('ffmpeg')
+		if not ffmpeg_path:
+				raise FFmpegError("FFmpeg executable not found")
+		
+		return ffmpeg_path
+
+@lru_cache(maxsize=256)
+def _probe_duration(input_file: str, mtime_ns: int, size: int) -> float:
+		"""Duration of one version of a file, cached on its mtime and size so edits re-probe.
+
+		Failures raise rather than return None, so lru_cache leaves them out
+		and a probe that timed out under load is retried on the next call.
+		"""
+		result = subprocess.run(
+				['ffprobe', '-v', 'quiet', '-print_format', 'json', '-show_format', input_file],
+				capture_output=True,
+				timeout=30
+		)
+		
+		if result.returncode != 0:
+				raise ValueError(f"ffprobe exited with {result.returncode}")
+		
+		data = json.loads(result.stdout)
+		return float(data['format']['duration'])
 
 class FFmpegProcessor:
 		"""
@@ -76,11 +150,15 @@ class FFmpegProcessor:
 								 timeout: int = 3600,
 								 max_memory_mb: int = 2048,
 								 temp_dir: str = None,
-								 log_level: int = logging.INFO):
+								 log_level: int = logging.INFO,
+								 strict_validation: bool = True):
 				
 				# Configuration
 				self.ffmpeg_path = self._get_safe_ffmpeg_path(ffmpeg_path)
 				self.timeout = timeout
+				# FFmpeg runs without a shell, so the metacharacter scan is defence in depth that
+				# callers passing filter graphs (which use ';') can switch off
+				self.strict_validation = strict_validation
 				self.max_memory_mb = max_memory_mb
 				self.temp_dir = temp_dir or tempfile.gettempdir()
 				
@@ -88,20 +166,7 @@ class FFmpegProcessor:
 				self.logger = self._setup_logger(log_level)
 				
 				# Event handlers
-				self.event_handlers: Dict[EventType, List[Callable]] = {
-						event_type: [] for event_type in EventType
-				}
-				
-				# Progress parsing patterns
-				self.progress_patterns = {
-						'frame': re.compile(r'frame=\s*(\d+)'),
-						'fps': re.compile(r'fps=\s*([0-9.]+)'),
-						'time': re.compile(r'out_time_ms=(\d+)'),
-						'bitrate': re.compile(r'bitrate=\s*([0-9.]+)kbits/s'),
-						'speed': re.compile(r'speed=\s*([0-9.]+)x'),
-						'size': re.compile(r'total_size=(\d+)'),
-						'progress': re.compile(r'progress=(\w+)')
-				}
+				self.event_handlers: List[List[Callable]] = [[] for _ in EventType]
 		
 		def _get_safe_ffmpeg_path(self, custom_path: str = None) -> str:
 				"""Get validated FFmpeg executable path"""
@@ -110,18 +175,7 @@ class FFmpegProcessor:
 								raise FFmpegSecurityError(f"Invalid FFmpeg path: {custom_path}")
 						return custom_path
 				
-				# Search in trusted paths
-				trusted_paths = ['/usr/bin/ffmpeg', '/usr/local/bin/ffmpeg', '/opt/homebrew/bin/ffmpeg']
-				for path in trusted_paths:
-						if os.path.isfile(path) and os.access(path, os.X_OK):
-								return path
-				
-				# Fallback to system PATH
-				ffmpeg_path = shutil.which('ffmpeg')
-				if not ffmpeg_path:
-						raise FFmpegError("FFmpeg executable not found")
-				
-				return ffmpeg_path
+				return _find_ffmpeg()
 		
 		def _setup_logger(self, log_level: int) -> logging.Logger:
 				"""Setup structured logging"""
@@ -138,50 +192,34 @@ class FFmpegProcessor:
 				
 				return logger
 		
-		def _validate_arguments(self, args: List[str]) -> List[str]:
-				"""Validate and sanitize FFmpeg arguments"""
+		def _validate_arguments(self, args: List[str], trusted: bool = False) -> List[str]:
+				"""Validate and sanitize FFmpeg arguments, skipping the metacharacter scan for trusted argv"""
 				if not isinstance(args, list):
 						raise FFmpegSecurityError("Arguments must be provided as a list")
 				
-				validated_args = []
-				
 				for arg in args:
 						if not isinstance(arg, str):
 								raise FFmpegSecurityError(f"All arguments must be strings, got: {type(arg)}")
-						
-						# Check for shell injection attempts
-						dangerous_chars = [';', '&', '|', '`', '$', '(', ')', '<', '>']
-						if any(char in arg for char in dangerous_chars):
-								raise FFmpegSecurityError(f"Potentially dangerous characters in argument: {arg}")
-						
-						validated_args.append(arg)
 				
-				return validated_args
+				# Check for shell injection attempts in one scan over every argument,
+				# only looking for the culprit once something has matched
+				if self.strict_validation and not trusted and _DANGEROUS_CHARS.search('\0'.join(args)):
+						arg = next(arg for arg in args if _DANGEROUS_CHARS.search(arg))
+						raise FFmpegSecurityError(f"Potentially dangerous characters in argument: {arg}")
+				
+				return list(args)
 		
 		def _parse_progress_line(self, line: str, total_duration: float = None) -> Optional[ProgressData]:
 				"""Parse FFmpeg progress output line"""
 				progress_data = ProgressData()
 				
-				for key, pattern in self.progress_patterns.items():
-						match = pattern.search(line)
-						if match:
-								value = match.group(1)
-								
-								if key == 'frame':
-										progress_data.frame = int(value)
-								elif key == 'fps':
-										progress_data.fps = float(value)
-								elif key == 'time':
-										# Convert microseconds to seconds
-										progress_data.time_seconds = int(value) / 1_000_000
-								elif key == 'bitrate':
-										progress_data.bitrate = int(float(value) * 1000)  # Convert to bits/s
-								elif key == 'speed':
-										progress_data.speed = float(value)
-								elif key == 'size':
-										progress_data.size = int(value)
-								elif key == 'progress':
-										progress_data.status = value
+				key, _, value = line.partition('=')
+				handler = _PROGRESS_HANDLERS.get(key.strip())
+				if handler:
+						try:
+								handler(progress_data, value.strip())
+						except ValueError:
+								pass  # FFmpeg reports N/A until a value is known
 				
 				# Calculate percentage if we have duration
 				if total_duration and progress_data.time_seconds:
@@ -194,46 +232,16 @@ class FFmpegProcessor:
 				]) else None
 		
 		def _get_media_duration(self, input_file: str) -> Optional[float]:
-				"""Get media duration using ffprobe"""
+				"""Get media duration using ffprobe, probing each version of a file once"""
 				try:
-						probe_cmd = [
-								'ffprobe', '-v', 'quiet', '-print_format', 'json',
-								'-show_format', input_file
-						]
-						
-						result = subprocess.run(
-								probe_cmd,
-								capture_output=True,
-								text=True,
-								timeout=30
-						)
-						
-						if result.returncode == 0:
-								data = json.loads(result.stdout)
-								return float(data['format']['duration'])
-								
-				except (subprocess.TimeoutExpired, json.JSONDecodeError, KeyError):
-						pass
-				
-				return None
-		
-		@contextmanager
-		def _managed_temp_file(self, suffix: str = '.tmp'):
-				"""Context manager for temporary file management"""
-				temp_file = tempfile.NamedTemporaryFile(
-						delete=False, 
-						suffix=suffix,
-						dir=self.temp_dir
-				)
-				temp_file.close()
-				
+						stat = os.stat(input_file)
+				except OSError:
+						return None
 				try:
-						yield temp_file.name
-				finally:
-						try:
-								os.unlink(temp_file.name)
-						except OSError:
-								pass
+						return _probe_duration(input_file, stat.st_mtime_ns, stat.st_size)
+				except (subprocess.TimeoutExpired, ValueError, KeyError):
+						# JSONDecodeError is a ValueError
+						return None
 		
 		def on(self, event_type: EventType, handler: Callable):
 				"""Register event handler"""
@@ -252,6 +260,9 @@ class FFmpegProcessor:
 										input_file: str = None,
 										capture_output: bool = True,
 										progress_callback: Callable[[ProgressData], None] = None,
+										duration: float = None,
+										stdin_data: Optional[bytes] = None,
+										trusted: bool = False,
 										**kwargs) -> Dict[str, Any]:
 				"""
 				Synchronous FFmpeg execution with progress monitoring.
@@ -261,288 +272,371 @@ class FFmpegProcessor:
 						input_file: Input file path for duration calculation
 						capture_output: Whether to capture stdout/stderr
 						progress_callback: Callback function for progress updates
+						duration: Known input duration in seconds (skips the ffprobe lookup)
+						stdin_data: Bytes written to FFmpeg's stdin (e.g. for a pipe:0 input)
+						trusted: The caller built args itself, so skip the metacharacter scan
 						**kwargs: Additional subprocess arguments
 						
 				Returns:
-						Dict with execution results including stdout, stderr, return_code
+						Dict with execution results including stdout, stderr, return_code.
+						stdout is None when it carried the progress stream.
 				"""
 				
 				# Validate arguments
-				validated_args = self._validate_arguments(args)
+				validated_args = self._validate_arguments(args, trusted)
 				command = [self.ffmpeg_path] + validated_args
 				
 				self.logger.info(f"Executing FFmpeg: {' '.join(command)}")
 				
 				# Get duration for progress calculation
-				duration = None
-				if input_file and progress_callback:
+				if duration is None and input_file and progress_callback:
 						duration = self._get_media_duration(input_file)
 				
-				# Setup progress monitoring
-				with self._managed_temp_file('.progress') as progress_file:
-						# Add progress reporting if callback provided
+				# Stream progress reports over stdout when a callback is provided
+				if progress_callback:
+						command.extend(['-progress', 'pipe:1'])
+				
+				# The stats line FFmpeg keeps rewriting on stderr is never shown once stderr is
+				# captured (or duplicated by -progress), it would only pile up in the buffer
+				if progress_callback or capture_output:
+						command.append('-nostats')
+				
+				# Emit start event
+				self._emit_event(EventType.STARTED, {'command': command})
+				
+				if stdin_data is not None:
+						kwargs['stdin'] = subprocess.PIPE
+				
+				try:
+						# Start process
+						process = subprocess.Popen(
+								command,
+								stdout=subprocess.PIPE if capture_output or progress_callback else None,
+								stderr=subprocess.PIPE if capture_output else None,
+								universal_newlines=True,
+								**kwargs
+						)
+						
+						# Let FFmpeg write well past the default 64 KiB before a full pipe blocks it
+						for stream in (process.stdout, process.stderr):
+								if stream is not None:
+										_grow_pipe(stream.fileno())
+						
+						if stdin_data is not None:
+								self._feed_stdin(process, stdin_data)
+						
+						# Monitor progress if callback provided, draining output as we go
 						if progress_callback:
-								command.extend(['-progress', progress_file])
+								stdout, stderr = self._monitor_progress_sync(process, duration, progress_callback)
+						else:
+								stdout, stderr = process.communicate(timeout=self.timeout)
 						
-						# Emit start event
-						self._emit_event(EventType.STARTED, {'command': command})
+						result = {
+								'returncode': process.returncode,
+								'stdout': stdout,
+								'stderr': stderr,
+								'command': command
+						}
 						
-						try:
-								# Start process
-								process = subprocess.Popen(
-										command,
-										stdout=subprocess.PIPE if capture_output else None,
-										stderr=subprocess.PIPE if capture_output else None,
-										universal_newlines=True,
-										**kwargs
+						if process.returncode == 0:
+								self._emit_event(EventType.COMPLETED, result)
+						else:
+								error = FFmpegProcessError(
+										f"FFmpeg failed with exit code {process.returncode}",
+										process.returncode,
+										stderr
 								)
-								
-								# Monitor progress if callback provided
-								if progress_callback:
-										self._monitor_progress_sync(
-												process, progress_file, duration, progress_callback
-										)
-								
-								# Wait for completion
-								stdout, stderr = process.communicate(timeout=self.timeout)
-								
-								result = {
-										'returncode': process.returncode,
-										'stdout': stdout,
-										'stderr': stderr,
-										'command': command
-								}
-								
-								if process.returncode == 0:
-										self._emit_event(EventType.COMPLETED, result)
-								else:
-										error = FFmpegProcessError(
-												f"FFmpeg failed with exit code {process.returncode}",
-												process.returncode,
-												stderr
-										)
-										self._emit_event(EventType.ERROR, error)
-										raise error
-								
-								return result
-								
-						except subprocess.TimeoutExpired:
-								process.kill()
-								process.wait()
-								error = FFmpegTimeoutError(f"FFmpeg timeout after {self.timeout}s")
 								self._emit_event(EventType.ERROR, error)
 								raise error
 						
-						except Exception as e:
-								if process.poll() is None:
-										process.terminate()
-										process.wait()
-								self._emit_event(EventType.ERROR, e)
-								raise
+						return result
+						
+				except subprocess.TimeoutExpired:
+						process.kill()
+						process.wait()
+						error = FFmpegTimeoutError(f"FFmpeg timeout after {self.timeout}s")
+						self._emit_event(EventType.ERROR, error)
+						raise error
+				
+				except Exception as e:
+						if process.poll() is None:
+								process.terminate()
+								process.wait()
+						self._emit_event(EventType.ERROR, e)
+						raise
+		
+		@staticmethod
+		def _feed_stdin(process: subprocess.Popen, data: bytes) -> None:
+				"""Write the whole stdin payload up front and close the pipe so FFmpeg sees EOF"""
+				fd = process.stdin.fileno()
+				_grow_pipe(fd)
+				try:
+						offset = 0
+						while offset < len(data):
+								offset += os.write(fd, data[offset:])
+				except BrokenPipeError:
+						pass  # FFmpeg exited early; its return code reports why
+				finally:
+						process.stdin.close()
+						# Already closed, so communicate() must not flush it again
+						process.stdin = None
 		
 		def _monitor_progress_sync(self, 
 															process: subprocess.Popen, 
-															progress_file: str,
 															duration: float,
-															callback: Callable[[ProgressData], None]):
-				"""Monitor progress synchronously"""
-				last_size = 0
+															callback: Callable[[ProgressData], None]) -> Tuple[Optional[str], Optional[str]]:
+				"""
+				Parse ``-progress pipe:1`` reports while draining the process's pipes.
 				
-				while process.poll() is None:
-						try:
-								# Read progress file
-								if os.path.exists(progress_file):
-										current_size = os.path.getsize(progress_file)
-										if current_size > last_size:
-												with open(progress_file, 'r') as f:
-														content = f.read()
-														
-												# Parse progress data
-												for line in content.strip().split('\n'):
-														if '=' in line:
-																progress_data = self._parse_progress_line(line, duration)
-																if progress_data:
-																		callback(progress_data)
-																		self._emit_event(EventType.PROGRESS, progress_data)
-												
-												last_size = current_size
+				One selector watches stdout, stderr and (where supported) a pidfd
+				for the process, so a chatty FFmpeg can't fill a pipe and stall
+				while we wait on it. Progress lines are parsed as they arrive on
+				stdout, with nothing polled or re-read, and we wake as soon as
+				FFmpeg writes or exits.
+				
+				Returns:
+						Tuple of (None, stderr text); stderr is None when not captured
+				"""
+				deadline = time.monotonic() + self.timeout
+				
+				selector = selectors.DefaultSelector()
+				output: Dict[Any, List[bytes]] = {}
+				for stream in (process.stdout, process.stderr):
+						if stream is not None:
+								selector.register(stream.fileno(), selectors.EVENT_READ, stream)
+								output[stream] = []
+				open_streams = len(output)
+				partial = b''
+				
+				pidfd = _open_pidfd(process.pid)
+				if pidfd is not None:
+						selector.register(pidfd, selectors.EVENT_READ)
+				
+				try:
+						while process.poll() is None or open_streams:
+								remaining = deadline - time.monotonic()
+								if remaining <= 0:
+										raise subprocess.TimeoutExpired(process.args, self.timeout)
 								
-								time.sleep(0.1)  # Small delay to prevent excessive file reading
+								# Stop watching the pidfd once it has fired, or select would spin
+								if pidfd is not None and process.returncode is not None:
+										selector.unregister(pidfd)
+										os.close(pidfd)
+										pidfd = None
 								
-						except (OSError, IOError):
-								continue
+								if not selector.get_map():
+										try:
+												process.wait(timeout=remaining)
+										except subprocess.TimeoutExpired:
+												pass
+										continue
+								
+								# Block until FFmpeg writes, closes its pipes or exits
+								for key, _ in selector.select(remaining):
+										if key.data is None:
+												continue
+										
+										chunk = os.read(key.fd, _PIPE_SIZE)
+										if not chunk:
+												selector.unregister(key.fd)
+												key.data.close()
+												open_streams -= 1
+										elif key.data is process.stdout:
+												# Only parse complete lines, carrying a partial one over
+												lines = (partial + chunk).split(b'\n')
+												partial = lines.pop()
+												for line in lines:
+														self._report_progress(line, duration, callback)
+										else:
+												output[key.data].append(chunk)
+				finally:
+						selector.close()
+						if pidfd is not None:
+								os.close(pidfd)
+				
+				stderr = self._decode_output(output[process.stderr]) if process.stderr in output else None
+				return None, stderr
+		
+		def _report_progress(self, line: bytes, duration: float, callback: Callable[[ProgressData], None]) -> None:
+				"""Parse one ``-progress`` line and pass it on if it carried progress"""
+				line = line.decode('utf-8', errors='replace').strip()
+				if '=' not in line:
+						return
+				
+				progress_data = self._parse_progress_line(line, duration)
+				if progress_data:
+						callback(progress_data)
+						self._emit_event(EventType.PROGRESS, progress_data)
+		
+		@staticmethod
+		def _decode_output(chunks: List[bytes]) -> str:
+				"""Decode drained pipe output the way Popen's text mode would"""
+				text = b''.join(chunks).decode('utf-8', errors='replace')
+				return text.replace('\r\n', '\n').replace('\r', '\n')
 		
 		async def execute_async(self,
 													 args: List[str],
 													 input_file: str = None,
 													 capture_output: bool = True,
 													 progress_callback: Optional[Callable[[ProgressData], None]] = None,
+													 duration: Optional[float] = None,
+													 stdin_data: Optional[bytes] = None,
+													 trusted: bool = False,
 													 **kwargs) -> Dict[str, Any]:
 				"""
 				Asynchronous FFmpeg execution with progress monitoring.
 				
+				Progress is streamed over FFmpeg's stdout (``-progress pipe:1``) and
+				parsed line by line as it arrives, so the coroutine only wakes when
+				FFmpeg has something to report instead of polling a progress file.
+				
 				Args:
 						args: FFmpeg arguments (without 'ffmpeg' prefix)
 						input_file: Input file path for duration calculation
 						capture_output: Whether to capture stdout/stderr
-						progress_callback: Async callback function for progress updates
+						progress_callback: Sync or async callback function for progress updates
+						duration: Known input duration in seconds (skips the ffprobe lookup)
+						stdin_data: Bytes written to FFmpeg's stdin (e.g. for a pipe:0 input)
+						trusted: The caller built args itself, so skip the metacharacter scan
 						**kwargs: Additional asyncio subprocess arguments
 						
 				Returns:
-						Dict with execution results including stdout, stderr, return_code
+						Dict with execution results including stdout, stderr, return_code.
+						stdout is None when it carried the progress stream.
 				"""
 				
 				# Validate arguments
-				validated_args = self._validate_arguments(args)
+				validated_args = self._validate_arguments(args, trusted)
 				command = [self.ffmpeg_path] + validated_args
 				
 				self.logger.info(f"Executing FFmpeg async: {' '.join(command)}")
 				
 				# Get duration for progress calculation
-				duration = None
-				if input_file and progress_callback:
+				if duration is None and input_file and progress_callback:
 						duration = await self._get_media_duration_async(input_file)
 				
-				# Setup progress monitoring
-				with self._managed_temp_file('.progress') as progress_file:
-						# Add progress reporting if callback provided
-						if progress_callback:
-								command.extend(['-progress', progress_file])
-						
-						# Emit start event
-						self._emit_event(EventType.STARTED, {'command': command})
-						
-						try:
-								# Start async process
-								process = await asyncio.create_subprocess_exec(
-										*command,
-										stdout=asyncio.subprocess.PIPE if capture_output else None,
-										stderr=asyncio.subprocess.PIPE if capture_output else None,
-										**kwargs
-								)
-								
-								# Monitor progress if callback provided
-								progress_task = None
-								if progress_callback:
-										progress_task = asyncio.create_task(
-												self._monitor_progress_async(
-														process, progress_file, duration, progress_callback
-												)
-										)
-								
-								# Wait for completion with timeout
-								try:
-										stdout, stderr = await asyncio.wait_for(
-												process.communicate(), 
-												timeout=self.timeout
-										)
-										
-										if progress_task:
-												progress_task.cancel()
-										
-										# Decode bytes to string if needed
-										if stdout:
-												stdout = stdout.decode('utf-8')
-										if stderr:
-												stderr = stderr.decode('utf-8')
-										
-										result = {
-												'returncode': process.returncode,
-												'stdout': stdout,
-												'stderr': stderr,
-												'command': command
-										}
-										
-										if process.returncode == 0:
-												self._emit_event(EventType.COMPLETED, result)
-										else:
-												error = FFmpegProcessError(
-														f"FFmpeg failed with exit code {process.returncode}",
-														process.returncode,
-														stderr
-												)
-												self._emit_event(EventType.ERROR, error)
-												raise error
-										
-										return result
-										
-								except asyncio.TimeoutError:
-										process.kill()
-										await process.wait()
-										if progress_task:
-												progress_task.cancel()
-										error = FFmpegTimeoutError(f"FFmpeg timeout after {self.timeout}s")
-										self._emit_event(EventType.ERROR, error)
-										raise error
-								
-						except Exception as e:
-								if process.returncode is None:
-										process.terminate()
-										await process.wait()
-								self._emit_event(EventType.ERROR, e)
-								raise
-		
-		async def _get_media_duration_async(self, input_file: str) -> Optional[float]:
-				"""Get media duration asynchronously using ffprobe"""
+				# Stream progress reports over stdout when a callback is provided
+				if progress_callback:
+						command.extend(['-progress', 'pipe:1'])
+				
+				# The stats line FFmpeg keeps rewriting on stderr is never shown once stderr is
+				# captured (or duplicated by -progress), it would only pile up in the buffer
+				if progress_callback or capture_output:
+						command.append('-nostats')
+				
+				# Emit start event
+				self._emit_event(EventType.STARTED, {'command': command})
+				
+				if stdin_data is not None:
+						kwargs['stdin'] = asyncio.subprocess.PIPE
+				
+				process = await asyncio.create_subprocess_exec(
+						*command,
+						stdout=asyncio.subprocess.PIPE if capture_output or progress_callback else None,
+						stderr=asyncio.subprocess.PIPE if capture_output else None,
+						**kwargs
+				)
+				
+				if progress_callback:
+						read_stdout = self._stream_progress_async(process.stdout, duration, progress_callback)
+				else:
+						read_stdout = self._read_stream_async(process.stdout)
+				
 				try:
-						process = await asyncio.create_subprocess_exec(
-								'ffprobe', '-v', 'quiet', '-print_format', 'json',
-								'-show_format', input_file,
-								stdout=asyncio.subprocess.PIPE,
-								stderr=asyncio.subprocess.PIPE
+						# Drain both pipes while waiting so neither can fill up and stall FFmpeg
+						stdout, stderr, *_ = await asyncio.wait_for(
+								asyncio.gather(
+										read_stdout,
+										self._read_stream_async(process.stderr),
+										process.wait(),
+										self._feed_stdin_async(process.stdin, stdin_data),
+								),
+								timeout=self.timeout
 						)
-						
-						stdout, _ = await asyncio.wait_for(process.communicate(), timeout=30)
-						
-						if process.returncode == 0:
-								data = json.loads(stdout.decode('utf-8'))
-								return float(data['format']['duration'])
-								
-				except (asyncio.TimeoutError, json.JSONDecodeError, KeyError):
-						pass
 				
-				return None
+				except asyncio.TimeoutError:
+						process.kill()
+						await process.wait()
+						error = FFmpegTimeoutError(f"FFmpeg timeout after {self.timeout}s")
+						self._emit_event(EventType.ERROR, error)
+						raise error
+				
+				except (Exception, asyncio.CancelledError) as e:
+						if process.returncode is None:
+								process.terminate()
+								await process.wait()
+						self._emit_event(EventType.ERROR, e)
+						raise
+				
+				result = {
+						'returncode': process.returncode,
+						'stdout': stdout,
+						'stderr': stderr,
+						'command': command
+				}
+				
+				if process.returncode != 0:
+						error = FFmpegProcessError(
+								f"FFmpeg failed with exit code {process.returncode}",
+								process.returncode,
+								stderr
+						)
+						self._emit_event(EventType.ERROR, error)
+						raise error
+				
+				self._emit_event(EventType.COMPLETED, result)
+				return result
+
+		async def _get_media_duration_async(self, input_file: str) -> Optional[float]:
+				"""Get media duration without blocking the loop, sharing the sync lookup's cache"""
+				return await asyncio.to_thread(self._get_media_duration, input_file)
 		
-		async def _monitor_progress_async(self,
-																		process: asyncio.subprocess.Process,
-																		progress_file: str,
+		@staticmethod
+		async def _feed_stdin_async(stream: Optional[asyncio.StreamWriter], data: Optional[bytes]) -> None:
+				"""Write the stdin payload, if any, and close the pipe so FFmpeg sees EOF"""
+				if stream is None or data is None:
+						return
+				try:
+						stream.write(data)
+						await stream.drain()
+				except (BrokenPipeError, ConnectionResetError):
+						pass  # FFmpeg exited early; its return code reports why
+				finally:
+						stream.close()
+		
+		@staticmethod
+		async def _read_stream_async(stream: Optional[asyncio.StreamReader]) -> Optional[str]:
+				"""Read a captured pipe to EOF, None for pipes not captured"""
+				if stream is None:
+						return None
+				return (await stream.read()).decode('utf-8', errors='replace')
+		
+		async def _stream_progress_async(self,
+																		stream: asyncio.StreamReader,
 																		duration: float,
-																		callback: Callable[[ProgressData], None]):
-				"""Monitor progress asynchronously"""
-				last_size = 0
-				
-				while process.returncode is None:
-						try:
-								# Read progress file
-								if os.path.exists(progress_file):
-										current_size = os.path.getsize(progress_file)
-										if current_size > last_size:
-												with open(progress_file, 'r') as f:
-														content = f.read()
-												
-												# Parse progress data
-												for line in content.strip().split('\n'):
-														if '=' in line:
-																progress_data = self._parse_progress_line(line, duration)
-																if progress_data:
-																		if asyncio.iscoroutinefunction(callback):
-																				await callback(progress_data)
-																		else:
-																				callback(progress_data)
-																		self._emit_event(EventType.PROGRESS, progress_data)
-												
-												last_size = current_size
-								
-								await asyncio.sleep(0.1)  # Non-blocking delay
-								
-						except (OSError, IOError):
-								continue
-						except asyncio.CancelledError:
+																		callback: Callable[[ProgressData], None]) -> None:
+				"""Parse ``-progress pipe:1`` reports as FFmpeg writes them"""
+				while True:
+						line = await stream.readline()
+						if not line:
 								break
+						
+						line = line.decode('utf-8', errors='replace').strip()
+						if '=' not in line:
+								continue
+						
+						progress_data = self._parse_progress_line(line, duration)
+						if progress_data:
+								if asyncio.iscoroutinefunction(callback):
+										await callback(progress_data)
+								else:
+										callback(progress_data)
+								self._emit_event(EventType.PROGRESS, progress_data)
 		
 		def convert_video(self,
 										 input_file: str,
 										 output_file: str,
+										 progress_callback: Callable[[ProgressData], None] = None,
 										 **options) -> Dict[str, Any]:
 				"""
 				High-level video conversion method.
@@ -550,52 +644,63 @@ class FFmpegProcessor:
 				Args:
 						input_file: Input video file path
 						output_file: Output video file path
+						progress_callback: Optional progress callback
 						**options: FFmpeg options (e.g., codec='libx264', preset='medium')
 						
 				Returns:
 						Dict with conversion results
 				"""
-				
-				# Build FFmpeg arguments
-				args = ['-i', input_file]
-				
-				# Add options
-				for key, value in options.items():
-						if key.startswith('codec'):
-								args.extend([f'-c:{key.split(":")[-1]}', value])
-						else:
-								args.extend([f'-{key}', str(value)])
-				
-				# Add output file
-				args.append(output_file)
-				
-				# Add overwrite flag
-				args.insert(0, '-y')
-				
-				return self.execute_sync(args, input_file)
+				args = self._convert_args(input_file, output_file, options)
+				return self.execute_sync(args, input_file, progress_callback=progress_callback)
 		
 		async def convert_video_async(self,
 																 input_file: str,
 																 output_file: str,
+																 progress_callback: Optional[Callable[[ProgressData], None]] = None,
 																 **options) -> Dict[str, Any]:
 				"""Async version of convert_video"""
-				
-				# Build FFmpeg arguments (same as sync version)
-				args = ['-i', input_file]
+				args = self._convert_args(input_file, output_file, options)
+				return await self.execute_async(args, input_file, progress_callback=progress_callback)
+		
+		@staticmethod
+		def _convert_args(input_file: str, output_file: str, options: Dict[str, Any]) -> List[str]:
+				"""Build convert_video's FFmpeg arguments in order, with the overwrite flag up front"""
+				args = ['-y', '-i', input_file]
 				
 				for key, value in options.items():
-						if key.startswith('codec'):
-								args.extend([f'-c:{key.split(":")[-1]}', value])
+						if key == 'codec':
+								# The bare codec option is the video codec, as in simple_convert
+								args.extend(['-c:v', value])
+						elif key.startswith('codec:'):
+								args.extend([f'-c:{key[6:]}', value])
 						else:
 								args.extend([f'-{key}', str(value)])
 				
 				args.append(output_file)
-				args.insert(0, '-y')
-				
-				return await self.execute_async(args, input_file)
+				return args
 
 # Convenience Functions for Common Use Cases
 
+@lru_cache(maxsize=8)
+def get_processor(timeout: int = 3600,
+									max_memory_mb: int = 2048,
+									ffmpeg_path: str = None,
+									strict_validation: bool = True) -> FFmpegProcessor:
+		"""
+		Return a shared FFmpegProcessor for the given settings.
+		
+		Tasks run many short FFmpeg commands; reusing one processor avoids
+		re-validating the executable and creating a logger per call. The
+		instance is shared, so callers that register event handlers should
+		construct their own FFmpegProcessor instead.
+		"""
+		return FFmpegProcessor(
+				ffmpeg_path=ffmpeg_path,
+				timeout=timeout,
+				max_memory_mb=max_memory_mb,
+				strict_validation=strict_validation
+		)
+
 def simple_convert(input_file: str, 
 									output_file: str,
 									codec: str = 'libx264',
@@ -614,14 +719,10 @@ def simple_convert(input_file: str,
 		Returns:
 				Conversion results
 		"""
-		processor = FFmpegProcessor()
-		
-		if progress_callback:
-				processor.on(EventType.PROGRESS, progress_callback)
-		
-		return processor.convert_video(
+		return get_processor().convert_video(
 				input_file, 
 				output_file,
+				progress_callback=progress_callback,
 				codec=codec,
 				preset=preset
 		)
@@ -632,14 +733,10 @@ async def simple_convert_async(input_file: str,
 															preset: str = 'medium',
 															progress_callback: Callable[[ProgressData], None] = None) -> Dict[str, Any]:
 		"""Async version of simple_convert"""
-		processor = FFmpegProcessor()
-		
-		if progress_callback:
-				processor.on(EventType.PROGRESS, progress_callback)
-		
-		return await processor.convert_video_async(
+		return await get_processor().convert_video_async(
 				input_file,
 				output_file,
+				progress_callback=progress_callback,
 				codec=codec,
 				preset=preset
 		)
@@ -651,7 +748,8 @@ class BatchProcessor:
 		
 		def __init__(self, max_concurrent: int = 4):
 				self.max_concurrent = max_concurrent
-				self.processor = FFmpegProcessor()
+				# Registers no event handlers, so the shared per-process instance is safe to reuse
+				self.processor = get_processor()
 		
 		async def process_batch_async(self,
 																 files: List[tuple],
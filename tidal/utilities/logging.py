@@ -1,8 +1,36 @@
+import asyncio
 import logging
+import time
+from collections import OrderedDict
+from functools import lru_cache, partial
 from typing import Optional
 from uuid import UUID, uuid4
 
-from prefect.exceptions import MissingContextError
+import httpx
+from prefect import get_run_logger
+from prefect.artifacts import aupdate_progress_artifact, create_progress_artifact, update_progress_artifact
+from prefect.context import FlowRunContext, TaskRunContext
+from prefect.exceptions import PrefectException
+
+# Minimum seconds between updates sent for one progress artifact; each is an API round-trip
+_PROGRESS_UPDATE_INTERVAL = 1.0
+
+# Transport and API failures that progress reporting shrugs off: httpx errors (PrefectHTTPStatusError
+# among them) and Prefect's client errors such as ObjectNotFound. Anything else is a caller bug and propagates.
+_PROGRESS_API_ERRORS = (httpx.HTTPError, PrefectException)
+
+# Progress changes smaller than this (in percent) are not worth a round-trip
+_PROGRESS_MIN_DELTA = 0.01
+
+# Artifacts whose last update is remembered; entries of tasks that failed before sending 100% age out
+_MAX_TRACKED_ARTIFACTS = 1024
+
+# The progress last sent for each in-flight artifact, and when, least recently updated first
+_last_progress_update: OrderedDict[UUID, tuple[float, float]] = OrderedDict()
+
+# Intermediate updates scheduled on a running event loop, by artifact, referenced until done so they
+# are not collected mid-flight
+_pending_updates: dict[UUID, set[asyncio.Task]] = {}
 
 
 def get_logger(name: str = "tidal") -> logging.Logger:
@@ -12,32 +40,121 @@ def get_logger(name: str = "tidal") -> logging.Logger:
 	run logger which provides structured logging integrated with the
 	Prefect UI. When called outside Prefect context (e.g. in tests),
 	falls back to a standard Python logger.
+
+	The run logger is looked up once per flow/task run and reused, and
+	the no-context case is detected without raising, since tasks call
+	this on every invocation.
 	"""
-	try:
-		from prefect import get_run_logger
+	task_run_context = TaskRunContext.get()
+	flow_run_context = FlowRunContext.get()
+	if task_run_context is None and flow_run_context is None:
+		return _named_logger(name)
+
+	task_run = task_run_context.task_run if task_run_context else None
+	flow_run = flow_run_context.flow_run if flow_run_context else None
+	return _run_logger(task_run.id if task_run else None, flow_run.id if flow_run else None)
 
-		return get_run_logger()
-	except MissingContextError:
-		return logging.getLogger(name)
+
+@lru_cache(maxsize=128)
+def _named_logger(name: str) -> logging.Logger:
+	"""The stdlib logger for ``name``, skipping the logging manager's lock after the first call."""
+	return logging.getLogger(name)
+
+
+@lru_cache(maxsize=512)
+def _run_logger(task_run_id: Optional[UUID], flow_run_id: Optional[UUID]) -> logging.LoggerAdapter:
+	"""The run logger for the current context, cached on the run ids it is bound to."""
+	return get_run_logger()
 
 
 def safe_create_progress(progress: float, description: str) -> Optional[UUID]:
 	"""Create a progress artifact, returning None if outside Prefect context."""
+	if TaskRunContext.get() is None and FlowRunContext.get() is None:
+		return None
 	try:
-		from prefect.artifacts import create_progress_artifact
-
 		return create_progress_artifact(progress=progress, description=description)
-	except (MissingContextError, Exception):
+	except _PROGRESS_API_ERRORS as e:
+		# Progress is best effort; an API hiccup must not fail the task
+		get_logger().debug(f"Could not create progress artifact: {e}")
 		return None
 
 
 def safe_update_progress(artifact_id: Optional[UUID], progress: float) -> None:
-	"""Update a progress artifact, silently no-op if outside Prefect context."""
-	if artifact_id is None:
+	"""Update a progress artifact, silently no-op if outside Prefect context.
+
+	Outside a run ``safe_create_progress`` hands out None, so the context
+	check is the ``artifact_id`` test below.
+
+	FFmpeg reports progress several times a second, so updates to one
+	artifact are sent at most once per ``_PROGRESS_UPDATE_INTERVAL`` and
+	the values in between are dropped, as are values that have not moved
+	since the last one sent (e.g. while FFmpeg stalls). Completion (100%)
+	is always sent.
+
+	Called from a running event loop (e.g. an async FFmpeg progress
+	callback), intermediate updates are scheduled on the loop and this
+	returns at once instead of blocking it for the API round-trip.
+	Completion is never left to the loop, which may stop before running
+	it: the artifact's outstanding updates are cancelled so none lands
+	after it, and it is sent before this returns.
+	"""
+	if not _should_send(artifact_id, progress):
+		return
+
+	try:
+		loop = asyncio.get_running_loop()
+	except RuntimeError:
+		loop = None
+
+	if loop is not None and progress < 100.0:
+		task = loop.create_task(_send_update_async(artifact_id, progress))
+		_pending_updates.setdefault(artifact_id, set()).add(task)
+		task.add_done_callback(partial(_forget_update, artifact_id))
 		return
+
+	for task in _pending_updates.pop(artifact_id, ()):
+		task.cancel()
+
 	try:
-		from prefect.artifacts import update_progress_artifact
+		# Forced sync: from an async context Prefect would otherwise return a coroutine nobody awaits
+		update_progress_artifact(artifact_id=artifact_id, progress=progress, _sync=True)
+	except _PROGRESS_API_ERRORS as e:
+		get_logger().debug(f"Could not update progress artifact {artifact_id}: {e}")
+
+
+def _should_send(artifact_id: Optional[UUID], progress: float) -> bool:
+	"""Whether an update is due for ``artifact_id``, recording it as sent if so."""
+	if artifact_id is None:
+		return False
+
+	now = time.monotonic()
+	if progress < 100.0:
+		last = _last_progress_update.get(artifact_id)
+		if last is not None:
+			last_progress, last_sent = last
+			if now - last_sent < _PROGRESS_UPDATE_INTERVAL or abs(progress - last_progress) < _PROGRESS_MIN_DELTA:
+				return False
+		_last_progress_update[artifact_id] = (progress, now)
+		_last_progress_update.move_to_end(artifact_id)
+		if len(_last_progress_update) > _MAX_TRACKED_ARTIFACTS:
+			_last_progress_update.popitem(last=False)
+	else:
+		_last_progress_update.pop(artifact_id, None)
+	return True
+
+
+async def _send_update_async(artifact_id: UUID, progress: float) -> None:
+	"""Send one progress update from the event loop, logging rather than raising on failure."""
+	try:
+		await aupdate_progress_artifact(artifact_id=artifact_id, progress=progress)
+	except _PROGRESS_API_ERRORS as e:
+		get_logger().debug(f"Could not update progress artifact {artifact_id}: {e}")
+
 
-		update_progress_artifact(artifact_id=artifact_id, progress=progress)
-	except (MissingContextError, Exception):
-		pass
+def _forget_update(artifact_id: UUID, task: asyncio.Task) -> None:
+	"""Drop a finished scheduled update, and the artifact's entry once none are left."""
+	pending = _pending_updates.get(artifact_id)
+	if pending is not None:
+		pending.discard(task)
+		if not pending:
+			del _pending_updates[artifact_id]
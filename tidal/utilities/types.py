@@ -1,7 +1,15 @@
 import enum
 
+try:
+	_StrEnum = enum.StrEnum
+except AttributeError:  # Python < 3.11
 
-class Environment(str, enum.Enum):
+	class _StrEnum(str, enum.Enum):
+		def __str__(self) -> str:
+			return self.value
+
+
+class Environment(_StrEnum):
 	LOCAL = "local"
 	STAGING = "staging"
 	PRODUCTION = "production"
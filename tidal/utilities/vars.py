@@ -1,13 +1,14 @@
-from pydantic import BaseModel
+import os
+from typing import NamedTuple
 
 
-class GlobalQueueConfig(BaseModel):
+class GlobalQueueConfig(NamedTuple):
 	name: str
 	limit: int
 	slot_decay_per_second: float
 
 
-class TaskQueueConfig(BaseModel):
+class TaskQueueConfig(NamedTuple):
 	name: str
 	limit: int
 
@@ -19,10 +20,20 @@ ENCODING_GLOBAL_QUEUE = GlobalQueueConfig(
 	slot_decay_per_second=1.0,
 )
 
+# Threads each chunk encode is given via -threads
+ENCODER_THREADS_PER_PROCESS = 4
+
 # Task-level concurrency limits
+# Each encode runs ENCODER_THREADS_PER_PROCESS threads, so cap concurrent
+# encodes to keep total encoder threads close to the deploying host's core count
 ENCODING_TASK_QUEUE = TaskQueueConfig(
 	name="encoding",
-	limit=6,
+	limit=max(1, (os.cpu_count() or 1) // ENCODER_THREADS_PER_PROCESS),
+)
+
+AUDIO_TASK_QUEUE = TaskQueueConfig(
+	name="audio",
+	limit=2,
 )
 
 SEGMENTATION_TASK_QUEUE = TaskQueueConfig(
@@ -35,5 +46,10 @@ VMAF_TASK_QUEUE = TaskQueueConfig(
 	limit=2,
 )
 
-TaskQueues = [ENCODING_TASK_QUEUE, SEGMENTATION_TASK_QUEUE, VMAF_TASK_QUEUE]
-GlobalQueues = [ENCODING_GLOBAL_QUEUE]
+TaskQueues: tuple[TaskQueueConfig, ...] = (
+	ENCODING_TASK_QUEUE,
+	AUDIO_TASK_QUEUE,
+	SEGMENTATION_TASK_QUEUE,
+	VMAF_TASK_QUEUE,
+)
+GlobalQueues: tuple[GlobalQueueConfig, ...] = (ENCODING_GLOBAL_QUEUE,)